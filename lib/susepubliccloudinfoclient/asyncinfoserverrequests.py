@@ -0,0 +1,349 @@
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+import asyncio
+import functools
+import sys
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from . import infoserverrequests as ifsrequest
+from .session import DEFAULT_POOL_SIZE
+
+# Coroutine counterparts of the get_*_data functions in
+# infoserverrequests with the same arguments, filters and formats.
+# Downloads go through the shared pooled session on a dedicated thread
+# pool, by default with as many requests at the same time as the session
+# keeps connections for.
+__max_requests = DEFAULT_POOL_SIZE
+__executor = None
+__executor_lock = threading.Lock()
+__semaphores = weakref.WeakKeyDictionary()
+
+
+def __get_executor():
+    """Return the thread pool the blocking work runs on"""
+    global __executor
+    with __executor_lock:
+        if __executor is None:
+            __executor = ThreadPoolExecutor(
+                max_workers=__max_requests,
+                thread_name_prefix='pint-async'
+            )
+        return __executor
+
+
+def __get_semaphore():
+    """Return the request limit of the running event loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = __semaphores.get(loop)
+    if semaphore is None:
+        semaphore = __semaphores[loop] = asyncio.Semaphore(__max_requests)
+    return semaphore
+
+
+async def __run(function, *args):
+    return await asyncio.get_running_loop().run_in_executor(
+        __get_executor(), functools.partial(function, *args)
+    )
+
+
+async def __fetch_document(url, info_type):
+    """
+        Fetch and parse one document within the request limit. When the
+        awaiting task is cancelled the download stops at the next item
+        and its connection is released.
+    """
+    cancelled = threading.Event()
+    async with __get_semaphore():
+        try:
+            return await __run(__read_document, url, info_type, cancelled)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+
+def __read_document(url, info_type, cancelled):
+    items = []
+    # leaving the loop drops the generator, which closes the response
+    for item in ifsrequest.__iter_document_items(url, info_type):
+        if cancelled.is_set():
+            break
+        items.append(item)
+    return items
+
+
+async def __get_items(urls, info_type):
+    """
+        Fetch the documents at the given URLs concurrently and merge them
+        in the order of the URLs; like the blocking API a failing region
+        is reported and skipped as long as one region delivered data.
+    """
+    if len(urls) == 1:
+        return await __fetch_document(urls[0], info_type)
+    results = await asyncio.gather(
+        *[__fetch_document(url, info_type) for url in urls],
+        return_exceptions=True
+    )
+    items = []
+    failed_urls = []
+    for url, result in zip(urls, results):
+        if isinstance(result, (LookupError, ValueError)):
+            failed_urls.append(url)
+            ifsrequest.__warn(
+                "No data retrieved from %s, skipping it." % url,
+                sys.stderr
+            )
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            items.extend(result)
+    if len(failed_urls) == len(urls):
+        ifsrequest.__error(
+            "Unable to retrieve data for any of the requested regions."
+        )
+    return items
+
+
+async def __process(urls, info_type, command_arg_filter, result_format, out):
+    """Fetch the items, then filter and format them off the event loop"""
+    items = await __get_items(urls, info_type)
+    return await __run(
+        __filter_and_output,
+        items,
+        info_type,
+        command_arg_filter,
+        result_format,
+        out
+    )
+
+
+def __filter_and_output(
+        items,
+        info_type,
+        command_arg_filter,
+        result_format,
+        out):
+    if command_arg_filter:
+        filters = ifsrequest.__parse_command_arg_filter(command_arg_filter)
+        if filters:
+            items = filter(ifsrequest.__compile_filters(filters), items)
+    return ifsrequest.__output(items, info_type, result_format, out)
+
+
+async def __process_single(
+        blocking,
+        framework,
+        info_type,
+        type,
+        result_format,
+        region,
+        command_arg_filter,
+        out):
+    if framework == ifsrequest.ALL_PROVIDERS:
+        # the blocking API queries the providers concurrently itself
+        return await __run(
+            blocking,
+            framework,
+            type,
+            result_format,
+            region,
+            command_arg_filter,
+            out
+        )
+    url = ifsrequest.__form_url(
+        framework,
+        info_type,
+        result_format,
+        region,
+        type,
+        apply_filters=command_arg_filter
+    )
+    return await __process(
+        [url], info_type, command_arg_filter, result_format, out
+    )
+
+
+def configure_concurrency(max_requests=DEFAULT_POOL_SIZE):
+    """
+        Limit the number of documents fetched at the same time. Beyond the
+        connection pool size of the session, see
+        infoserverrequests.configure_session, connections are not reused.
+    """
+    global __max_requests, __executor
+    with __executor_lock:
+        __max_requests = max_requests
+        if __executor is not None:
+            __executor.shutdown(wait=False)
+            __executor = None
+    __semaphores.clear()
+
+
+async def get_provider_data(
+        framework,
+        type,
+        result_format='plain',
+        region='all',
+        command_arg_filter=None,
+        out=None):
+    """Asynchronous infoserverrequests.get_provider_data"""
+    return await __process_single(
+        ifsrequest.get_provider_data,
+        framework,
+        'providers',
+        type,
+        result_format,
+        region,
+        command_arg_filter,
+        out
+    )
+
+
+async def get_image_states_data(
+        framework,
+        type,
+        result_format='plain',
+        region='all',
+        command_arg_filter=None,
+        out=None):
+    """Asynchronous infoserverrequests.get_image_states_data"""
+    return await __process_single(
+        ifsrequest.get_image_states_data,
+        framework,
+        'states',
+        type,
+        result_format,
+        region,
+        command_arg_filter,
+        out
+    )
+
+
+async def get_server_types_data(
+        framework,
+        type,
+        result_format='plain',
+        region='all',
+        command_arg_filter=None,
+        out=None):
+    """Asynchronous infoserverrequests.get_server_types_data"""
+    return await __process_single(
+        ifsrequest.get_server_types_data,
+        framework,
+        'types',
+        type,
+        result_format,
+        region,
+        command_arg_filter,
+        out
+    )
+
+
+async def get_regions_data(
+        framework,
+        type,
+        result_format='plain',
+        region='all',
+        command_arg_filter=None,
+        out=None):
+    """Asynchronous infoserverrequests.get_regions_data"""
+    return await __process_single(
+        ifsrequest.get_regions_data,
+        framework,
+        'regions',
+        type,
+        result_format,
+        region,
+        command_arg_filter,
+        out
+    )
+
+
+async def get_image_data(
+        framework,
+        image_state,
+        result_format='plain',
+        region='all',
+        command_arg_filter=None,
+        out=None):
+    """Asynchronous infoserverrequests.get_image_data"""
+    info_type = 'images'
+    # the snapshot and the framework all are left to the blocking API
+    if ifsrequest.__snapshot_enabled or framework == ifsrequest.ALL_PROVIDERS:
+        return await __run(
+            ifsrequest.get_image_data,
+            framework,
+            image_state,
+            result_format,
+            region,
+            command_arg_filter,
+            out
+        )
+    urls = [
+        ifsrequest.__form_url(
+            framework,
+            info_type,
+            result_format,
+            region_name,
+            image_state,
+            apply_filters=command_arg_filter
+        )
+        for region_name in ifsrequest.__split_regions(region)
+    ]
+    return await __process(
+        urls, info_type, command_arg_filter, result_format, out
+    )
+
+
+async def get_server_data(
+        framework,
+        server_type,
+        result_format='plain',
+        region='all',
+        command_arg_filter=None,
+        out=None):
+    """Asynchronous infoserverrequests.get_server_data"""
+    info_type = 'servers'
+    # the snapshot and the framework all are left to the blocking API
+    if ifsrequest.__snapshot_enabled or framework == ifsrequest.ALL_PROVIDERS:
+        return await __run(
+            ifsrequest.get_server_data,
+            framework,
+            server_type,
+            result_format,
+            region,
+            command_arg_filter,
+            out
+        )
+    urls = [
+        ifsrequest.__form_url(
+            framework,
+            info_type,
+            result_format,
+            region_name,
+            server_type=server_type,
+            apply_filters=command_arg_filter
+        )
+        for region_name in ifsrequest.__split_regions(region)
+    ]
+    return await __process(
+        urls, info_type, command_arg_filter, result_format, out
+    )
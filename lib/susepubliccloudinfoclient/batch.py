@@ -0,0 +1,198 @@
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from . import infoserverrequests as ifsrequest
+
+# Query types, named like the pint commands, and their information types
+INFO_TYPES = {
+    'providers': 'providers',
+    'image_states': 'states',
+    'server_types': 'types',
+    'regions': 'regions',
+    'images': 'images',
+    'servers': 'servers'
+}
+
+
+def read_queries(lines):
+    """
+        Parse query specs given one JSON object per line, for example
+        {"provider": "amazon", "type": "images", "region": "us-east-1",
+        "state": "active", "filter": "name~sles"}. Blank lines and lines
+        starting with # are skipped, a line that is not a JSON object is
+        passed on as a string and answered with an error.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield line
+
+
+def run_batch(queries):
+    """
+        Answer the queries and yield one result per query, in order. The
+        documents the queries need are fetched once each, concurrently,
+        and every query is evaluated against the shared parsed items. A
+        result holds the query and the items under the information type,
+        or an error message under error.
+    """
+    providers = []
+
+    def all_providers():
+        # looked up once, for the first query of the framework all
+        if not providers:
+            providers.extend(
+                provider.name for provider in ifsrequest.get_providers()
+            )
+        return providers
+    plans = [__plan(query, all_providers) for query in queries]
+    infos = {}
+    for plan in plans:
+        for url in plan['urls']:
+            infos[url] = plan['info_type']
+    workers = max(1, min(ifsrequest.__max_workers, len(infos)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = dict(
+            (url, executor.submit(ifsrequest.__get_document_items, url, info))
+            for url, info in infos.items()
+        )
+        for plan in plans:
+            yield __answer(plan, futures)
+
+
+def write_results(results, out=sys.stdout):
+    """Write the results as one JSON object per line"""
+    for result in results:
+        out.write(json.dumps(result, sort_keys=True) + '\n')
+
+
+def __plan(query, all_providers):
+    """
+        Work out the URLs a query needs, or why it cannot be answered. A
+        query of the framework all needs the URLs of every provider, from
+        all_providers(), its items are tagged with their provider.
+    """
+    plan = {
+        'query': query,
+        'info_type': None,
+        'urls': [],
+        'providers': {},
+        'filters': [],
+        'error': None
+    }
+    if not isinstance(query, dict):
+        plan['error'] = 'Not a JSON object.'
+        return plan
+    query_type = query.get('type')
+    info_type = INFO_TYPES.get(query_type)
+    if not info_type:
+        plan['error'] = 'Unknown type %s, expected one of %s.' % (
+            json.dumps(query_type), ', '.join(sorted(INFO_TYPES))
+        )
+        return plan
+    framework = query.get('provider')
+    if not framework and query_type not in ('providers', 'image_states'):
+        plan['error'] = 'No provider given.'
+        return plan
+    try:
+        plan['filters'] = ifsrequest.__parse_command_arg_filter(
+            query.get('filter'), strict=True
+        )
+    except ValueError as e:
+        plan['error'] = str(e)
+        return plan
+    region = query.get('region') or 'all'
+    if info_type in ('images', 'servers'):
+        regions = ifsrequest.__split_regions(region)
+    else:
+        regions = [region]
+    if info_type == 'images':
+        doc_type = query.get('state')
+    else:
+        doc_type = query.get('server_type')
+    frameworks = [framework]
+    if framework == ifsrequest.ALL_PROVIDERS:
+        try:
+            frameworks = all_providers()
+        except (LookupError, ValueError) as e:
+            plan['error'] = str(e)
+            return plan
+    plan['info_type'] = info_type
+    for framework_name in frameworks:
+        for region_name in regions:
+            url = ifsrequest.__form_url(
+                framework_name,
+                info_type,
+                region=region_name,
+                image_state=doc_type
+            )
+            plan['urls'].append(url)
+            if framework == ifsrequest.ALL_PROVIDERS:
+                plan['providers'][url] = framework_name
+    return plan
+
+
+def __answer(plan, futures):
+    """Collect the items of a planned query and apply its filters"""
+    result = {'query': plan['query']}
+    if plan['error']:
+        result['error'] = plan['error']
+        return result
+    items = []
+    errors = []
+    for url in plan['urls']:
+        try:
+            url_items = futures[url].result()
+        except (LookupError, ValueError) as e:
+            errors.append((url, e))
+            continue
+        provider = plan['providers'].get(url)
+        if provider:
+            url_items = [__tag(item, provider) for item in url_items]
+        items.extend(url_items)
+    if len(errors) == len(plan['urls']):
+        result['error'] = '\n'.join('%s: %s' % error for error in errors)
+        return result
+    # like a pint query over several regions, answer from the others
+    for url, e in errors:
+        ifsrequest.__warn(
+            'No data retrieved from %s, skipping it.' % url, sys.stderr
+        )
+    if plan['filters']:
+        items = list(
+            filter(ifsrequest.__compile_filters(plan['filters']), items)
+        )
+    result[plan['info_type']] = items
+    return result
+
+
+def __tag(item, provider):
+    """Return a copy of item tagged with its provider"""
+    tagged = {'provider': provider}
+    tagged.update(item)
+    return tagged
@@ -0,0 +1,123 @@
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+import json
+import os
+import tempfile
+import time
+
+from . import infoserverrequests as ifsrequest
+from .responsecache import get_default_cache_dir
+
+# Used until the first successful refresh wrote a snapshot
+BUNDLED_PROVIDERS = ['amazon', 'google', 'microsoft', 'oracle']
+BUNDLED_IMAGE_STATES = ['active', 'inactive', 'deprecated', 'deleted']
+
+REFRESH_INTERVAL = 24 * 3600
+
+
+def get_snapshot_path():
+    """Return the location of the snapshot file"""
+    return os.path.join(
+        os.path.dirname(get_default_cache_dir()), 'bootstrap.json'
+    )
+
+
+def load_snapshot(path=None):
+    """Return the stored snapshot or the bundled one"""
+    try:
+        with open(path or get_snapshot_path(), 'r') as snapshot_file:
+            snapshot = json.load(snapshot_file)
+        if snapshot['providers'] and snapshot['states']:
+            return snapshot
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return {
+        'providers': list(BUNDLED_PROVIDERS),
+        'states': list(BUNDLED_IMAGE_STATES),
+        'stored': 0
+    }
+
+
+def needs_refresh(snapshot):
+    """Whether the snapshot is old enough to ask the server again"""
+    last_attempt = max(
+        snapshot.get('stored', 0), snapshot.get('attempted', 0)
+    )
+    return time.time() - last_attempt > REFRESH_INTERVAL
+
+
+def fetch_snapshot():
+    """Get providers and image states from the server"""
+    return {
+        'providers': [
+            provider.name for provider in ifsrequest.get_providers()
+        ],
+        'states': [state.name for state in ifsrequest.get_image_states()],
+        'stored': time.time()
+    }
+
+
+def save_snapshot(snapshot, path=None):
+    """Atomically write the snapshot"""
+    path = path or get_snapshot_path()
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as tmp_file:
+            json.dump(snapshot, tmp_file)
+        os.replace(tmp_path, path)
+    except OSError:
+        os.unlink(tmp_path)
+        raise
+
+
+def refresh_snapshot(path=None):
+    """Fetch, store and return a new snapshot"""
+    snapshot = fetch_snapshot()
+    try:
+        save_snapshot(snapshot, path)
+    except OSError:
+        # still good for this invocation
+        pass
+    return snapshot
+
+
+def refresh_in_background(snapshot, path=None):
+    """
+        Refresh the snapshot in a separate thread, pint does not wait
+        long for it on exit
+    """
+    # Remember the attempt, without network access we would otherwise
+    # try again on every invocation
+    try:
+        save_snapshot(dict(snapshot, attempted=time.time()), path)
+    except OSError:
+        pass
+
+    def refresh():
+        try:
+            # the user did not ask for this, failures go unreported
+            ifsrequest.call_quietly(refresh_snapshot, path)
+        except Exception:
+            pass
+
+    return ifsrequest.run_in_background('pint-bootstrap', refresh)
@@ -0,0 +1,344 @@
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+import re
+from array import array
+
+from . import infoserverrequests as ifsrequest
+
+try:
+    import numpy
+except ImportError:
+    # filters fall back to testing row by row
+    numpy = None
+
+# Dates are YYYYMMDD strings, kept as integers with 0 for an empty date
+DATE_COLUMNS = ('publishedon', 'deprecatedon', 'deletedon')
+EMPTY_DATE = 0
+MISSING_DATE = -1
+DATE_PATTERN = re.compile(r'^[0-9]{8}$')
+MAX_DATE = 2 ** 31 - 1
+
+# Columns with more distinct values than this share of the rows are not
+# worth a dictionary and keep their values in a plain list
+DICTIONARY_RATIO = 0.5
+
+# Relative cost of the filter operators, as in __compile_filters
+FILTER_COST = {'=': 0, '>': 1, '<': 1, '~': 2, '!': 3, '%': 4}
+
+# Names with two leading underscores would be mangled in the class bodies
+_parse_command_arg_filter = ifsrequest.__parse_command_arg_filter
+_compile_filters = ifsrequest.__compile_filters
+_output = ifsrequest.__output
+
+
+class _DictionaryColumn(object):
+    """Each distinct value is stored once, rows refer to it by number"""
+
+    def __init__(self, rows=0):
+        self.values = [None]
+        self.codes_by_value = {None: 0}
+        self.codes = array('I', [0]) * rows
+
+    def append(self, value):
+        code = self.codes_by_value.get(value)
+        if code is None:
+            code = self.codes_by_value[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def get(self, row):
+        return self.values[self.codes[row]]
+
+    def matches(self, test, attr, rows):
+        # every distinct value is tested only once
+        passed = [
+            value is not None and test({attr: value})
+            for value in self.values
+        ]
+        codes = self.codes
+        return [row for row in rows if passed[codes[row]]]
+
+    def mask(self, test, attr, operator, value, selected):
+        passed = numpy.fromiter(
+            (
+                candidate is not None and test({attr: candidate})
+                for candidate in self.values
+            ),
+            dtype=bool,
+            count=len(self.values)
+        )
+        return passed[numpy.frombuffer(self.codes, dtype=numpy.uintc)]
+
+    def compact(self):
+        """Return the column in its most compact form"""
+        # the lookup table is only needed while appending
+        self.codes_by_value = None
+        if len(self.values) > len(self.codes) * DICTIONARY_RATIO:
+            return _PlainColumn(
+                [self.values[code] for code in self.codes]
+            )
+        return self
+
+
+class _PlainColumn(object):
+
+    def __init__(self, values):
+        self.values = values
+        self.lowered = None
+
+    def get(self, row):
+        return self.values[row]
+
+    def matches(self, test, attr, rows):
+        values = self.values
+        return [
+            row for row in rows
+            if values[row] is not None and test({attr: values[row]})
+        ]
+
+    def mask(self, test, attr, operator, value, selected):
+        """Test only the rows still selected, one at a time"""
+        if operator in '~!%':
+            # substring and regex filters compare lowered values, lower
+            # the column once for all filters
+            if self.lowered is None:
+                self.lowered = [
+                    candidate.lower() if candidate is not None else None
+                    for candidate in self.values
+                ]
+            values = self.lowered
+            value = value.lower()
+            if operator == '~':
+                def test(candidate):
+                    return value in candidate
+            elif operator == '!':
+                def test(candidate):
+                    return value not in candidate
+            else:
+                match = re.compile(value).match
+
+                def test(candidate):
+                    return match(candidate) is not None
+        else:
+            values = self.values
+            item_test = test
+
+            def test(candidate):
+                return item_test({attr: candidate})
+        passed = numpy.zeros(len(values), dtype=bool)
+        passed[[
+            row for row in numpy.flatnonzero(selected).tolist()
+            if values[row] is not None and test(values[row])
+        ]] = True
+        return passed
+
+
+class _DateColumn(object):
+    """Dates packed into an array of integers"""
+
+    def __init__(self, rows=0):
+        self.dates = array('i', [MISSING_DATE]) * rows
+
+    def append(self, value):
+        if value is None:
+            self.dates.append(MISSING_DATE)
+        elif value == '':
+            self.dates.append(EMPTY_DATE)
+        elif DATE_PATTERN.match(value):
+            self.dates.append(int(value))
+        else:
+            raise ValueError(value)
+
+    def get(self, row):
+        date = self.dates[row]
+        if date == MISSING_DATE:
+            return None
+        elif date == EMPTY_DATE:
+            return ''
+        return '%08d' % date
+
+    def matches(self, test, attr, rows, operator=None, value=None):
+        dates = self.dates
+        if operator in ('<', '>'):
+            bound = int(value)
+            if operator == '<':
+                return [
+                    row for row in rows
+                    if dates[row] > EMPTY_DATE and dates[row] < bound
+                ]
+            return [row for row in rows if dates[row] > bound]
+        return [
+            row for row in rows
+            if dates[row] != MISSING_DATE and test({attr: self.get(row)})
+        ]
+
+    def mask(self, test, attr, operator, value, selected):
+        dates = numpy.frombuffer(self.dates, dtype=numpy.intc)
+        if operator == '>':
+            return dates > min(int(value), MAX_DATE)
+        elif operator == '<':
+            return (dates > EMPTY_DATE) & (dates < min(int(value), MAX_DATE))
+        elif DATE_PATTERN.match(value):
+            return dates == int(value)
+        return numpy.zeros(len(dates), dtype=bool)
+
+    def as_dictionary(self):
+        column = _DictionaryColumn()
+        for row in range(len(self.dates)):
+            column.append(self.get(row))
+        return column
+
+    def compact(self):
+        return self
+
+
+class ColumnSet(object):
+    """
+        Column oriented container for the items of a server response.
+        Repeated values such as regions and states are stored once, dates
+        as integers. Iterating yields the items as dicts one at a time,
+        with the keys in the order they were first seen.
+    """
+
+    def __init__(self, items, info_type='images'):
+        self.info_type = info_type
+        self.columns = {}
+        self.size = 0
+        self.rows = None
+        for item in items:
+            self.__append(item)
+        for name, column in self.columns.items():
+            self.columns[name] = column.compact()
+
+    def __append(self, item):
+        columns = self.columns
+        for name in item:
+            if name not in columns:
+                if name in DATE_COLUMNS:
+                    columns[name] = _DateColumn(self.size)
+                else:
+                    columns[name] = _DictionaryColumn(self.size)
+        for name, column in columns.items():
+            value = item.get(name)
+            try:
+                column.append(value)
+            except ValueError:
+                # not a date after all
+                column = columns[name] = column.as_dictionary()
+                column.append(value)
+        self.size += 1
+
+    def __len__(self):
+        if self.rows is None:
+            return self.size
+        return len(self.rows)
+
+    def __iter__(self):
+        columns = list(self.columns.items())
+        for row in self.__selected_rows():
+            item = {}
+            for name, column in columns:
+                value = column.get(row)
+                if value is not None:
+                    item[name] = value
+            yield item
+
+    def __selected_rows(self):
+        if self.rows is None:
+            return range(self.size)
+        return self.rows
+
+    def column(self, name):
+        """Return the values of a column for the selected items"""
+        column = self.columns[name]
+        return [column.get(row) for row in self.__selected_rows()]
+
+    def filter(self, command_arg_filter):
+        """
+            Return a ColumnSet of the items matching a --filter argument,
+            sharing the columns of this one. Items without the filtered
+            attribute do not match. With NumPy installed each filter yields
+            a mask over the whole column, dates compare as integer arrays.
+        """
+        filters = _parse_command_arg_filter(command_arg_filter)
+        selection = ColumnSet((), self.info_type)
+        selection.columns = self.columns
+        selection.size = self.size
+        if numpy is not None and filters and self.size:
+            selection.rows = self.__select_vectorized(filters)
+        else:
+            selection.rows = array('I', self.__select(filters))
+        return selection
+
+    def __select(self, filters):
+        """Narrow down the selected rows filter by filter"""
+        rows = self.__selected_rows()
+        for a_filter in filters:
+            attr = a_filter['attr']
+            column = self.columns.get(attr)
+            if column is None:
+                return []
+            test = _compile_filters([a_filter])
+            if isinstance(column, _DateColumn):
+                rows = column.matches(
+                    test, attr, rows, a_filter['operator'], a_filter['value']
+                )
+            else:
+                rows = column.matches(test, attr, rows)
+        return rows
+
+    def __select_vectorized(self, filters):
+        """Combine a mask over all rows per filter"""
+        if self.rows is None:
+            mask = numpy.ones(self.size, dtype=bool)
+        else:
+            mask = numpy.zeros(self.size, dtype=bool)
+            mask[numpy.frombuffer(self.rows, dtype=numpy.uintc)] = True
+        columns = []
+        for a_filter in filters:
+            column = self.columns.get(a_filter['attr'])
+            if column is None:
+                return array('I')
+            columns.append((column, a_filter))
+        # whole column masks first, they leave fewer rows for the filters
+        # testing the rows of plain columns one by one
+        columns.sort(key=lambda column_filter: (
+            isinstance(column_filter[0], _PlainColumn),
+            FILTER_COST[column_filter[1]['operator']]
+        ))
+        for column, a_filter in columns:
+            mask &= column.mask(
+                _compile_filters([a_filter]),
+                a_filter['attr'],
+                a_filter['operator'],
+                a_filter['value'],
+                mask
+            )
+        rows = array('I')
+        rows.frombytes(numpy.flatnonzero(mask).astype(numpy.uintc).tobytes())
+        return rows
+
+    def format(self, result_format='plain', out=None):
+        """
+            Format the items like the get_*_data functions do, or write them
+            to out and return their number
+        """
+        return _output(iter(self), self.info_type, result_format, out)
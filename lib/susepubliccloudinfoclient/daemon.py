@@ -0,0 +1,299 @@
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+# The client side runs before anything else in bin/pint, keep the imports
+# of this module light
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+from .responsecache import get_default_cache_dir
+
+DEFAULT_REFRESH_INTERVAL = 300
+
+# Threads working for no command line, their output stays in the daemon
+BACKGROUND_THREADS = ('pint-refresh', 'pint-bootstrap')
+
+# Set in the daemon, which runs pint itself and must not forward to itself
+serving = False
+
+
+def get_socket_path():
+    """Return the location of the daemon socket"""
+    return os.environ.get('PINT_SOCKET') or os.path.join(
+        os.path.dirname(get_default_cache_dir()), 'pint.sock'
+    )
+
+
+def can_forward(argv):
+    """Whether the command line can be answered by a running daemon"""
+    if serving or os.environ.get('PINT_NO_DAEMON'):
+        return False
+    if argv[:1] == ['serve']:
+        return False
+    # the daemon has no access to our standard input
+    if argv[:1] == ['batch'] and argv[1:2] in ([], ['-']):
+        return False
+    return not any(
+        arg == '-' or arg.endswith('=-') for arg in argv
+    )
+
+
+def forward(argv, socket_path=None, stdout=None, stderr=None):
+    """
+        Run a pint command line in the daemon and copy its output. Return
+        the exit status, or None if no daemon answered and the command has
+        to run here. The daemon runs it in our working directory, relative
+        paths on the command line name the same files.
+    """
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(socket_path or get_socket_path())
+        request = {'argv': argv, 'cwd': os.getcwd()}
+        connection.sendall((json.dumps(request) + '\n').encode())
+        answered = False
+        for line in connection.makefile('r', encoding='utf-8'):
+            answered = True
+            message = json.loads(line)
+            if 'out' in message:
+                stdout.write(message['out'])
+            elif 'err' in message:
+                stderr.write(message['err'])
+            elif 'exit' in message:
+                return message['exit']
+    except (OSError, ValueError):
+        answered = False
+    finally:
+        connection.close()
+    # the daemon went away, after output was copied we cannot start over
+    return 1 if answered else None
+
+
+class DocumentStore(object):
+    """Parsed documents kept in memory, keyed by URL"""
+
+    def __init__(self):
+        self.documents = {}
+        self.lock = threading.Lock()
+
+    def get(self, url):
+        with self.lock:
+            document = self.documents.get(url)
+        return document and document[1]
+
+    def put(self, url, info_type, items):
+        with self.lock:
+            self.documents[url] = (info_type, items)
+        return items
+
+    def refresh(self, fetch):
+        """Replace every document by what fetch(url, info_type) returns"""
+        with self.lock:
+            documents = list(self.documents.items())
+        for url, (info_type, items) in documents:
+            try:
+                self.put(url, info_type, fetch(url, info_type))
+            except (LookupError, ValueError):
+                # keep answering from what we have
+                pass
+
+
+class _Output(object):
+    """
+        Stand-in for sys.stdout or sys.stderr, sends what is written while
+        a command line runs to its client, including the output of the
+        threads it starts
+    """
+
+    def __init__(self, key, fallback):
+        self.key = key
+        self.fallback = fallback
+        self.send = None
+
+    def write(self, text):
+        background = threading.current_thread().name in BACKGROUND_THREADS
+        if self.send and not background:
+            self.send({self.key: text})
+        else:
+            self.fallback.write(text)
+        return len(text)
+
+    def flush(self):
+        self.fallback.flush()
+
+    def isatty(self):
+        return False
+
+
+def serve(script, socket_path=None, refresh_interval=DEFAULT_REFRESH_INTERVAL):
+    """
+        Answer pint command lines sent to the socket by running script,
+        bin/pint, in this process. Downloaded documents stay parsed in
+        memory and are refreshed every refresh_interval seconds. One
+        command line runs at a time as pint configures module state.
+    """
+    global serving
+    import socketserver
+    serving = True
+    stdout = _Output('out', sys.stdout)
+    stderr = _Output('err', sys.stderr)
+    sys.stdout, sys.stderr = stdout, stderr
+    # imported after the stand-ins are in place, default arguments of the
+    # warning and error functions refer to them
+    from . import infoserverrequests as ifsrequest
+    store = DocumentStore()
+    ifsrequest.configure_documents(store)
+    with open(script, 'r') as script_file:
+        code = compile(script_file.read(), script, 'exec')
+    lock = threading.Lock()
+    # not mangled, unlike its name would be in the class body
+    run_script = __run_script
+
+    class Handler(socketserver.StreamRequestHandler):
+
+        def handle(self):
+            try:
+                request = json.loads(self.rfile.readline())
+                argv = request['argv']
+                cwd = request.get('cwd')
+            except (ValueError, KeyError, TypeError, AttributeError):
+                return
+
+            sending = threading.Lock()
+
+            def send(message):
+                line = (json.dumps(message) + '\n').encode()
+                # worker threads of the command line write too
+                with sending:
+                    self.wfile.write(line)
+            with lock:
+                status = run_script(
+                    code, script, argv, cwd, send, stdout, stderr
+                )
+            try:
+                send({'exit': status})
+            except OSError:
+                pass
+
+    path = socket_path or get_socket_path()
+    __remove_stale_socket(path)
+    server = socketserver.ThreadingUnixStreamServer(path, Handler)
+    server.daemon_threads = True
+    os.chmod(path, 0o600)
+    refresher = threading.Thread(
+        target=__refresh_periodically,
+        args=(store, refresh_interval, ifsrequest, lock),
+        name='pint-refresh',
+        daemon=True
+    )
+    refresher.start()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        os.unlink(path)
+
+
+def __run_script(code, script, argv, cwd, send, stdout, stderr):
+    """
+        Run pint with argv in the directory cwd, sending the output, and
+        return the exit status
+    """
+    from . import infoserverrequests as ifsrequest
+    # nothing the previous command line configured carries over
+    ifsrequest.reset_configuration()
+    for output in (stdout, stderr):
+        output.send = send
+    saved_cwd = os.getcwd()
+    saved_argv = sys.argv
+    sys.argv = [script] + argv
+    status = 0
+    try:
+        try:
+            os.chdir(cwd or saved_cwd)
+        except OSError as e:
+            raise SystemExit('Error: %s' % e)
+        exec(code, {'__name__': '__main__', '__file__': script})
+    except SystemExit as e:
+        if isinstance(e.code, str):
+            stderr.write(e.code + '\n')
+            status = 1
+        else:
+            status = e.code or 0
+    except OSError:
+        # the client went away
+        status = 1
+    except Exception as e:
+        stderr.write('Error: %s\n' % e)
+        status = 1
+    finally:
+        sys.argv = saved_argv
+        os.chdir(saved_cwd)
+        for output in (stdout, stderr):
+            output.send = None
+    return status
+
+
+def __refresh_periodically(store, interval, ifsrequest, lock):
+    while True:
+        time.sleep(interval)
+        __refresh_documents(store, ifsrequest, lock)
+
+
+def __refresh_documents(store, ifsrequest, lock):
+    """
+        Revalidate the documents in store through the response cache with
+        settings of their own, not those the last command line left
+        behind. Documents are fetched between command lines, which
+        configure the same module.
+    """
+    def fetch(url, info_type):
+        with lock:
+            ifsrequest.reset_configuration()
+            ifsrequest.configure_cache(ttl=0)
+            try:
+                return ifsrequest.call_quietly(
+                    ifsrequest.__fetch_document_items, url, info_type
+                )
+            finally:
+                ifsrequest.reset_configuration()
+
+    store.refresh(fetch)
+
+
+def __remove_stale_socket(path):
+    """Remove a socket left behind, refuse to replace a running daemon"""
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise OSError('pint serve is already running on %s' % path)
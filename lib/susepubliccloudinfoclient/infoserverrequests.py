@@ -18,125 +18,142 @@
 # <http://www.gnu.org/licenses/>.
 #
 
+import atexit
+import codecs
+import itertools
 import json
 import re
-import requests
 import sys
-import urllib
-from lxml import etree
-
-
-def __apply_filters(superset, filters):
-    # map operators to filter functions
-    filter_operations = {
-        '=': __filter_exact,
-        '~': __filter_substring,
-        '!': __filter_not_substring,
-        '%': __filter_regex,
-        '>': __filter_greater_than,
-        '<': __filter_less_than
+import threading
+import time
+import urllib.parse
+
+from .jsonstream import iter_array_items
+from .memo import Memo
+from .records import Image, ImageState, Provider, Region, Server, ServerType
+from .responsecache import ResponseCache
+
+# requests, lxml and the thread pool are imported where first needed, a
+# command answered from the cache or asking for --help does without them
+
+__cache = None
+__cache_refresh = False
+__cache_offline = False
+__refreshing = set()
+__refreshing_lock = threading.Lock()
+__background = []
+# seconds pint waits on exit for work left in the background
+__background_grace = 1
+__session = None
+__session_lock = threading.Lock()
+__max_workers = 8
+__chunk_size = 64 * 1024
+__plain_window = 500
+__snapshot_enabled = False
+__snapshot_path = None
+__documents = None
+__memo = None
+__flights = {}
+__flights_lock = threading.Lock()
+__flight_timeout = 300
+# items of a document kept for threads asking for it while it is streamed
+__flight_window = 10000
+
+# The framework name querying all providers at once
+ALL_PROVIDERS = 'all'
+__timing_hooks = []
+__timing_frames = threading.local()
+__quiet = threading.local()
+
+
+def __compile_filters(filters):
+    """
+        Turn the parsed filters into a single predicate. Values are lowered,
+        compiled or converted once, and the cheapest and most selective
+        tests run first so most items are rejected early.
+    """
+    # map operators to match builders, ordered by cost and selectivity
+    match_builders = {
+        '=': (0, __match_exact),
+        '>': (1, __match_greater_than),
+        '<': (1, __match_less_than),
+        '~': (2, __match_substring),
+        '!': (3, __match_not_substring),
+        '%': (4, __match_regex)
     }
-    # prepopulate the result set with all the items
-    result_set = superset
-    # run through the filters, allowing each to reduce the result set...
-    for a_filter in filters:
-        result_set = filter_operations[a_filter['operator']](
-            result_set,
+    ordered_filters = sorted(
+        filters,
+        key=lambda a_filter: match_builders[a_filter['operator']][0]
+    )
+    tests = tuple(
+        match_builders[a_filter['operator']][1](
             a_filter['attr'],
             a_filter['value']
         )
-    return result_set
+        for a_filter in ordered_filters
+    )
+    if len(tests) == 1:
+        return tests[0]
 
+    def predicate(item):
+        for test in tests:
+            if not test(item):
+                return False
+        return True
+    return predicate
 
-def __filter_exact(items, attr, value):
-    """
-        select from items list where the attribute is an exact match to 'value'
-    """
-    # start with an empty result set
-    filtered_items = []
-    # iterate over the list of items
-    for item in items:
-        # append the current item to the result set if matching
-        if item[attr] == value:
-            filtered_items.append(item)
-    # return the filtered list
-    return filtered_items
-
-
-def __filter_substring(items, attr, value):
-    """select from items list where 'value' is a substring of the attribute"""
-    # start with an empty result set
-    filtered_items = []
-    # iterate over the list of items
-    for item in items:
-        # append the current item to the result set if matching
-        if value.lower() in item[attr].lower():
-            filtered_items.append(item)
-    # return the filtered list
-    return filtered_items
 
+def __match_exact(attr, value):
+    """match where the attribute is an exact match to 'value'"""
+    return lambda item: item[attr] == value
 
-def __filter_not_substring(items, attr, value):
-    """
-        select from items list where 'value' is not a substring of the
-        attribute
-    """
-    # start with an empty result set
-    filtered_items = []
-    # iterate over the list of items
-    for item in items:
-        # append the current item to the result set if matching
-        if value.lower() not in item[attr].lower():
-            filtered_items.append(item)
-    # return the filtered list
-    return filtered_items
 
+def __match_substring(attr, value):
+    """match where 'value' is a substring of the attribute"""
+    value = value.lower()
+    return lambda item: value in item[attr].lower()
+
+
+def __match_not_substring(attr, value):
+    """match where 'value' is not a substring of the attribute"""
+    value = value.lower()
+    return lambda item: value not in item[attr].lower()
 
-def __filter_regex(items, attr, value):
-    """
-        select from items list where 'value' is a regex matching the attribute
-    """
-    # start with an empty result set
-    filtered_items = []
-    # iterate over the list of items
-    for item in items:
-        # append the current item to the result set if matching
-        if re.match(value.lower(), item[attr].lower()):
-            filtered_items.append(item)
-    # return the filtered list
-    return filtered_items
 
+def __match_regex(attr, value):
+    """match where 'value' is a regex matching the attribute"""
+    match = re.compile(value.lower()).match
+    return lambda item: match(item[attr].lower()) is not None
 
-def __filter_less_than(items, attr, value):
+
+def __match_less_than(attr, value):
     """
-        select from items list where the attribute is less than 'value' as
-        integers
+        match where the attribute is less than 'value' as integers, an
+        attribute that is not a number (e.g. an empty date) never matches
     """
-    # start with an empty result set
-    filtered_items = []
-    # iterate over the list of items
-    for item in items:
-        # append the current item to the result set if matching
-        if int(item[attr]) < int(value):
-            filtered_items.append(item)
-    # return the filtered list
-    return filtered_items
+    bound = int(value)
+
+    def test(item):
+        try:
+            return int(item[attr]) < bound
+        except ValueError:
+            return False
+    return test
 
 
-def __filter_greater_than(items, attr, value):
+def __match_greater_than(attr, value):
     """
-        select from items list where the attribute is greater than 'value' as
-        integers
+        match where the attribute is greater than 'value' as integers, an
+        attribute that is not a number (e.g. an empty date) never matches
     """
-    # start with an empty result set
-    filtered_items = []
-    # iterate over the list of items
-    for item in items:
-        # append the current item to the result set if matching
-        if int(item[attr]) > int(value):
-            filtered_items.append(item)
-    # return the filtered list
-    return filtered_items
+    bound = int(value)
+
+    def test(item):
+        try:
+            return int(item[attr]) > bound
+        except ValueError:
+            return False
+    return test
 
 
 def __form_url(
@@ -182,29 +199,252 @@ def __get_base_url():
     # return 'http://localhost:9292'
 
 
-def __get_data(url):
-    """Make the request and return the data or None in case of failure"""
+def __fetch(url, stream=False):
+    """
+        Return a tuple of the cache entry to answer from and the server
+        response to read instead. Both are None in case of failure.
+    """
+    entry = None
+    headers = {}
+    if __cache:
+        entry = __cache.lookup(url, load_body=not stream)
+    if __cache_offline:
+        return __offline_entry(url, entry), None
+    if entry and not __cache_refresh:
+        if __cache.is_fresh(entry):
+            if __timing_hooks:
+                __emit('cache', url=url, result='hit')
+            return entry, None
+        if __cache.is_usable(entry):
+            # answer right away, the next query gets the refreshed copy
+            __warn_stale(url, entry, 'refreshing it in the background')
+            __refresh_in_background(url)
+            if __timing_hooks:
+                __emit('cache', url=url, result='stale')
+            return entry, None
+        # ask the server whether our copy is still current
+        headers = __validators(entry)
+    import requests
+    response = None
+    stage = __enter_stage() if __timing_hooks else None
     try:
-        response = requests.get(url)
+        response = __get_session().get(url, headers=headers, stream=stream)
         response.raise_for_status()
-    except requests.exceptions.HTTPError as e:
+    except requests.exceptions.RequestException as e:
+        if response is not None:
+            response.close()
+        if stage:
+            __emit('request', url=url, seconds=__leave_stage(stage))
+        if entry and __cache.is_usable(entry):
+            __warn_stale(url, entry, 'the server could not be reached')
+            if __timing_hooks:
+                __emit('cache', url=url, result='fallback')
+            return entry, None
+        __report_request_exception(e)
+        return None, None
+    if stage:
+        # the time to the response headers, the rest went to name
+        # resolution, connecting and the TLS handshake
+        __emit(
+            'request',
+            url=url,
+            seconds=__leave_stage(stage),
+            server_seconds=response.elapsed.total_seconds(),
+            status=response.status_code
+        )
+    revalidated = response.status_code == 304 and headers
+    if __timing_hooks and __cache:
+        __emit(
+            'cache',
+            url=url,
+            result='revalidated' if revalidated else 'miss'
+        )
+    if revalidated:
+        response.close()
+        return __cache.revalidated(url, entry), None
+    return None, response
+
+
+def __validators(entry):
+    """Return the headers of a request revalidating entry"""
+    headers = {}
+    if entry.etag:
+        headers['If-None-Match'] = entry.etag
+    if entry.last_modified:
+        headers['If-Modified-Since'] = entry.last_modified
+    return headers
+
+
+def __offline_entry(url, entry):
+    """Return the cache entry to answer from without asking the server"""
+    if entry is None or not __cache.is_usable(entry):
+        __error(
+            "No cached copy of %s recent enough to answer offline." % url
+        )
+    if __cache.is_fresh(entry):
+        if __timing_hooks:
+            __emit('cache', url=url, result='hit')
+    else:
+        __warn_stale(url, entry, 'answering offline')
+        if __timing_hooks:
+            __emit('cache', url=url, result='stale')
+    return entry
+
+
+def __warn_stale(url, entry, reason):
+    __warn(
+        "Using the copy of %s cached %s ago, %s." % (
+            url, __format_age(__cache.age(entry)), reason
+        ),
+        sys.stderr
+    )
+
+
+def __format_age(seconds):
+    if seconds < 2 * 3600:
+        return '%d minutes' % (seconds // 60)
+    elif seconds < 2 * 86400:
+        return '%d hours' % (seconds // 3600)
+    return '%d days' % (seconds // 86400)
+
+
+def __refresh_in_background(url):
+    """
+        Refresh the cache entry for url in a separate thread, once per URL
+        at a time
+    """
+    with __refreshing_lock:
+        if url in __refreshing:
+            return
+        __refreshing.add(url)
+    return run_in_background('pint-refresh', __refresh, url, __cache)
+
+
+def __refresh(url, cache):
+    """Revalidate or download the cache entry for url, quietly"""
+    import requests
+    try:
+        entry = cache.lookup(url, load_body=False)
+        headers = __validators(entry) if entry else {}
+        response = __get_session().get(url, headers=headers, stream=True)
+        try:
+            response.raise_for_status()
+            if response.status_code == 304 and headers:
+                cache.revalidated(url, entry)
+            else:
+                for chunk in cache.store_chunks(
+                        url,
+                        response.iter_content(chunk_size=__chunk_size),
+                        response.headers.get('ETag'),
+                        response.headers.get('Last-Modified')):
+                    pass
+        finally:
+            response.close()
+    except requests.exceptions.RequestException:
+        # keep the stale copy, the next query tries again
+        pass
+    finally:
+        with __refreshing_lock:
+            __refreshing.discard(url)
+
+
+def __open_data(url):
+    """
+        Make the request and return an iterator over the data in text
+        chunks as they arrive, or None in case of failure
+    """
+    entry, response = __fetch(url, stream=True)
+    if entry:
+        chunks = __cache.iter_body(entry)
+        if __timing_hooks:
+            chunks = __timed(
+                chunks, 'download', size=len, url=url, source='cache'
+            )
+    elif response is not None:
+        chunks = __iter_response(response)
+        if __timing_hooks:
+            chunks = __timed(
+                chunks,
+                'download',
+                size=len,
+                url=url,
+                source='server',
+                encoding=response.headers.get('Content-Encoding', 'identity'),
+                transferred=lambda: __transferred_bytes(response)
+            )
+        if __cache:
+            chunks = __cache.store_chunks(
+                url,
+                chunks,
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified')
+            )
+    else:
+        return None
+    return __iter_decoded(chunks)
+
+
+def __iter_decoded(chunks):
+    """Decode chunks of bytes, the documents are JSON and thus UTF-8"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    decoder.decode(b'', final=True)
+
+
+def __iter_response(response):
+    """Yield the body of a streamed response in chunks of bytes"""
+    import requests
+    try:
+        for chunk in response.iter_content(chunk_size=__chunk_size):
+            yield chunk
+    except requests.exceptions.RequestException as e:
+        __report_request_exception(e)
+    finally:
+        response.close()
+
+
+def __transferred_bytes(response):
+    """
+        Return the size of the body of response received so far as it was
+        sent, compressed or not, or None if the response does not tell
+    """
+    try:
+        return response.raw.tell()
+    except (AttributeError, OSError):
+        return None
+
+
+def __report_request_exception(e):
+    """Turn a failed request into an error for the user"""
+    import requests
+    if isinstance(e, requests.exceptions.HTTPError):
         __error("The server responded with an error.\n%s" % e)
-    except requests.exceptions.Timeout as e:
+    elif isinstance(e, requests.exceptions.Timeout):
         __error("The server did not respond in a timely fashion.\n%s" % e)
-    except requests.exceptions.SSLError as e:
+    elif isinstance(e, requests.exceptions.SSLError):
         __error(
             "There was a problem with the security of this request:\n%s" % e
         )
-    except requests.exceptions.ConnectionError as e:
+    elif isinstance(e, requests.exceptions.ConnectionError):
         __error(
             "There was a problem connecting to the server. "
             "Please check your network connection.\n%s" % e
         )
-    except requests.exceptions.RequestException as e:
-        __error(e)
     else:
-        assert response.text, "No data was returned by the server!"
-        return response.text
+        __error(e)
+
+
+def __get_session():
+    """Return the HTTP session shared by all requests"""
+    global __session
+    with __session_lock:
+        if __session is None:
+            from .session import InfoServerSession
+            __session = InfoServerSession()
+        return __session
 
 
 def __inflect(plural):
@@ -216,8 +456,11 @@ def __inflect(plural):
     return inflections[plural]
 
 
-def __parse_command_arg_filter(command_arg_filter=None):
-    """Break down the --filter argument into a list of filters"""
+def __parse_command_arg_filter(command_arg_filter=None, strict=False):
+    """
+        Break down the --filter argument into a list of filters, an invalid
+        phrase is ignored with a warning or, if strict, raises ValueError
+    """
     valid_filters = {
         'id':
             r'^(?P<attr>id)(?P<operator>[=])(?P<value>.+)$',
@@ -251,56 +494,829 @@ def __parse_command_arg_filter(command_arg_filter=None):
                     filters.append(match.groupdict())
                     break
             else:
+                if strict:
+                    raise ValueError("Invalid filter phrase '%s'." % phrase)
                 # if we can't break out with a valid filter, warn the user
                 __warn("Invalid filter phrase '%s' will be ignored." % phrase)
     # return any valid filters we found
     return filters
 
 
-def __parse_server_response_data(server_response_data, info_type):
-    return json.loads(server_response_data)[info_type]
+def __reformat(items, info_type, result_format):
+    return ''.join(__iter_reformat(items, info_type, result_format))
 
 
-def __reformat(items, info_type, result_format):
+def __iter_reformat(items, info_type, result_format):
+    """
+        Yield the formatted output in pieces as the items arrive. The
+        first piece is only produced once the first item (or the end of
+        the items) is known, an empty result is produced as a single piece.
+    """
     if result_format == 'json':
-        return json.dumps(
-            {info_type: items},
+        return __iter_json(items, info_type)
+    elif result_format == 'ndjson':
+        return __iter_ndjson(items)
+    elif result_format == 'xml':
+        return __iter_xml(items, info_type)
+    # default to plain text output
+    else:
+        return __iter_plain(items)
+
+
+def __iter_json(items, info_type):
+    """
+        Incremental equivalent of
+        json.dumps({info_type: items}, sort_keys=True, indent=2,
+                   separators=(',', ': '))
+    """
+    items = iter(items)
+    key = json.dumps(info_type)
+    item = next(items, None)
+    if item is None:
+        yield '{\n  %s: []\n}' % key
+        return
+    opening = '{\n  %s: [\n    ' % key
+    while item is not None:
+        # strings are escaped, the only newlines are the indentation ones
+        yield opening + json.dumps(
+            item,
             sort_keys=True,
             indent=2,
-            separators=(',', ': '))
-    # default to XML output (until we have a plain formatter)
-    else:
-        # elif result_format == 'xml':
-        root = etree.Element(info_type)
-        for item in items:
-            etree.SubElement(root, __inflect(info_type), item)
-        return etree.tostring(
-            root,
-            xml_declaration=True,
-            encoding='UTF-8',
-            pretty_print=True).decode()
+            separators=(',', ': ')).replace('\n', '\n    ')
+        opening = ',\n    '
+        item = next(items, None)
+    yield '\n  ]\n}'
+
+
+def __iter_ndjson(items):
+    """One compact JSON object per line"""
+    separator = ''
+    for item in items:
+        yield separator + json.dumps(
+            item, sort_keys=True, separators=(',', ':')
+        )
+        separator = '\n'
+    if not separator:
+        yield ''
+
+
+def __iter_plain(items):
+    """
+        Column aligned text with a header line. The columns and their
+        widths are taken from the first items so the output can start
+        right away; longer values further down shift the rest of their
+        line.
+    """
+    items = iter(items)
+    head = list(itertools.islice(items, __plain_window))
+    if not head:
+        yield ''
+        return
+    columns = []
+    for item in head:
+        for column in item:
+            if column not in columns:
+                columns.append(column)
+    widths = [
+        max([len(column)] + [len(str(item.get(column, ''))) for item in head])
+        for column in columns
+    ]
+    # no padding after the last column
+    row_format = '  '.join(
+        ['%%-%ds' % width for width in widths[:-1]] + ['%s']
+    )
+    yield row_format % tuple(columns)
+    for item in itertools.chain(head, items):
+        yield '\n' + (
+            row_format % tuple(item.get(column, '') for column in columns)
+        ).rstrip()
+
+
+def __iter_xml(items, info_type):
+    """
+        Incremental equivalent of serializing an info_type element with one
+        child per item, pretty printed with an XML declaration
+    """
+    from lxml import etree
+    items = iter(items)
+    tag = __inflect(info_type)
+    declaration = "<?xml version='1.0' encoding='UTF-8'?>\n"
+    item = next(items, None)
+    if item is None:
+        yield declaration + etree.tostring(
+            etree.Element(info_type), encoding='unicode'
+        ) + '\n'
+        return
+    opening = declaration + '<%s>\n' % info_type
+    while item is not None:
+        yield opening + '  ' + etree.tostring(
+            etree.Element(tag, item), encoding='unicode'
+        ) + '\n'
+        opening = ''
+        item = next(items, None)
+    yield '</%s>\n' % info_type
 
 
 def __warn(str, out=sys.stdout):
-    out.write("Warning: %s\n" % str)
+    if not getattr(__quiet, 'enabled', False):
+        out.write("Warning: %s\n" % str)
 
 
 def __error(str, out=sys.stderr):
-    out.write("Error: %s\n" % str)
+    if not getattr(__quiet, 'enabled', False):
+        out.write("Error: %s\n" % str)
     raise LookupError(str)
 
 
-def __process(url, info_type, command_arg_filter, result_format):
+def __get_document_items(url, info_type):
+    """Fetch and parse the document at url"""
+    return list(__iter_document_items(url, info_type))
+
+
+def __iter_document_items(url, info_type):
+    """
+        Yield the items of the document at url while it is downloaded, or
+        from the document store like from the response cache, or from the
+        memo
+    """
+    if __documents is None or __cache is None:
+        if __memo is not None:
+            return iter(__memoized(
+                ('document', url),
+                [url],
+                lambda: list(__share_document_items(url, info_type))
+            ))
+        return __share_document_items(url, info_type)
+    items = None
+    if not __cache_refresh:
+        items = __documents.get(url)
+        if items is not None and __timing_hooks:
+            __emit('cache', url=url, result='memory')
+    if items is None:
+        items = __documents.put(
+            url, info_type, list(__share_document_items(url, info_type))
+        )
+    return iter(items)
+
+
+class __Flight(object):
+    """A document being fetched, and the threads waiting for it"""
+
+    def __init__(self):
+        self.thread = threading.current_thread()
+        self.followers = 0
+        self.items = []
+        self.complete = False
+        self.error = None
+        self.done = threading.Event()
+
+
+def __share_document_items(url, info_type):
+    """
+        Yield the items of the document at url, fetched once for all threads
+        asking for it at the same time. The first thread streams the
+        document; threads asking while it does wait for it and share its
+        parsed items. To keep the memory of a thread streaming on its own
+        flat, the items are kept for joining threads up to __flight_window
+        of them, threads asking after that fetch the document anew.
+    """
+    with __flights_lock:
+        flight = __flights.get(url)
+        if flight is None:
+            flight = __flights[url] = __Flight()
+            leader = True
+        elif flight.thread is threading.current_thread():
+            flight = None
+        else:
+            flight.followers += 1
+            leader = False
+    if flight is None:
+        return __stream_document_items(url, info_type)
+    if leader:
+        return __lead_flight(url, info_type, flight)
+    return __follow_flight(url, info_type, flight)
+
+
+def __lead_flight(url, info_type, flight):
+    try:
+        items = __stream_document_items(url, info_type)
+    except Exception as e:
+        flight.error = e
+        __land_flight(url, flight)
+        raise
+    return __relay_flight(url, items, flight)
+
+
+def __relay_flight(url, items, flight):
+    """Yield the items, keeping them for the followers"""
+    try:
+        for item in items:
+            if flight.items is not None:
+                flight.items.append(item)
+                if len(flight.items) == __flight_window:
+                    __close_flight(url, flight)
+            yield item
+        __close_flight(url, flight)
+        flight.complete = True
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        __land_flight(url, flight)
+
+
+def __close_flight(url, flight):
+    """Stop threads from joining the flight, keep items only for followers"""
+    with __flights_lock:
+        if __flights.get(url) is flight:
+            del __flights[url]
+        if not flight.followers:
+            flight.items = None
+
+
+def __land_flight(url, flight):
+    __close_flight(url, flight)
+    flight.done.set()
+
+
+def __follow_flight(url, info_type, flight):
+    if flight.done.wait(__flight_timeout):
+        if flight.complete:
+            if __timing_hooks:
+                __emit('cache', url=url, result='shared')
+            return iter(flight.items)
+        if flight.error is not None:
+            raise flight.error
+    # the leading thread gave up on the document, fetch it here
+    return __stream_document_items(url, info_type)
+
+
+def __fetch_document_items(url, info_type):
+    """Fetch and parse the document at url, bypassing the document store"""
+    return list(__stream_document_items(url, info_type))
+
+
+def __stream_document_items(url, info_type):
+    chunks = __open_data(url)
+    if chunks is None:
+        return iter(())
+    if __timing_hooks:
+        return __timed(__iter_items(chunks, info_type), 'parse', url=url)
+    return __iter_items(chunks, info_type)
+
+
+def __iter_items(chunks, info_type):
     """
-        given a URL, the type of information, maybe some filters, and an
-        expected format, do the right thing
+        Yield the items of a document, then read it to the end, the
+        response cache only stores a document read completely
     """
-    server_response_data = __get_data(url)
-    resultset = __parse_server_response_data(server_response_data, info_type)
+    chunks = iter(chunks)
+    for item in iter_array_items(chunks, info_type):
+        yield item
+    for chunk in chunks:
+        pass
+
+
+def __get_items(urls, info_type):
+    """
+        Fetch and parse the documents at the given URLs, one per region.
+        A single document is parsed item by item as it arrives. Several
+        documents are fetched concurrently and merged in the order of the
+        URLs; a failing region is reported and skipped as long as at least
+        one region delivered data.
+    """
+    if len(urls) == 1:
+        return __iter_document_items(urls[0], info_type)
+    workers = min(__max_workers, len(urls))
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(__get_document_items, url, info_type)
+            for url in urls
+        ]
+    items = []
+    failed_urls = []
+    for url, future in zip(urls, futures):
+        try:
+            items.extend(future.result())
+        except (LookupError, ValueError):
+            failed_urls.append(url)
+            __warn("No data retrieved from %s, skipping it." % url, sys.stderr)
+    if len(failed_urls) == len(urls):
+        __error("Unable to retrieve data for any of the requested regions.")
+    return items
+
+
+def __query(urls, info_type, command_arg_filter):
+    """
+        Return an iterator over the items at the URLs passing the filters,
+        with the memo the items passing the same filters are kept
+    """
+    if __memo is None or not command_arg_filter:
+        return __filter_items(__get_items(urls, info_type), command_arg_filter)
+    filters = __parse_command_arg_filter(command_arg_filter)
+    if not filters:
+        return __get_items(urls, info_type)
+    key = ('result', tuple(urls), tuple(sorted(
+        (a_filter['attr'], a_filter['operator'], a_filter['value'])
+        for a_filter in filters
+    )))
+    return iter(__memoized(
+        key,
+        urls,
+        lambda: list(
+            __apply_filter_list(__get_items(urls, info_type), filters)
+        )
+    ))
+
+
+def __filter_items(items, command_arg_filter):
+    """Return an iterator over the items passing the filters"""
     if command_arg_filter:
-        filters = __parse_command_arg_filter(command_arg_filter)
-        resultset = __apply_filters(resultset, filters)
-    return __reformat(resultset, info_type, result_format)
+        items = __apply_filter_list(
+            items, __parse_command_arg_filter(command_arg_filter)
+        )
+    return items
+
+
+def __apply_filter_list(items, filters):
+    """Return an iterator over the items passing the parsed filters"""
+    if filters and __timing_hooks:
+        items = __timed_filters(items, filters)
+    elif filters:
+        items = filter(__compile_filters(filters), items)
+    return items
+
+
+def __memoized(key, urls, compute):
+    """
+        Return the items kept in the memo for key, or compute and keep them.
+        A refresh computes them anew.
+    """
+    memo = __memo
+    items = None
+    if not __cache_refresh:
+        items = memo.get(key)
+        if items is not None and __timing_hooks:
+            for url in urls:
+                __emit('cache', url=url, result='memory')
+    if items is None:
+        items = memo.put(key, compute())
+    return items
+
+
+def __timed_filters(items, filters):
+    """
+        Apply the filters one after the other, reporting the items each
+        one lets through, rather than in a single compiled pass
+    """
+    for a_filter in filters:
+        counter = __Counter(items)
+        items = __timed(
+            filter(__compile_filters([a_filter]), counter),
+            'filter',
+            filter='%(attr)s%(operator)s%(value)s' % a_filter,
+            items_in=lambda counter=counter: counter.count
+        )
+    return items
+
+
+def __query_snapshot(
+        framework,
+        info_type,
+        region,
+        doc_type,
+        command_arg_filter):
+    """Like __query, but answer from the local snapshot database"""
+    import sqlite3
+    from . import snapshot
+    regions = __split_regions(region)
+    if regions == ['all']:
+        regions = None
+    try:
+        return snapshot.query_snapshot(
+            framework,
+            info_type,
+            regions,
+            doc_type,
+            __parse_command_arg_filter(command_arg_filter),
+            __snapshot_path
+        )
+    except sqlite3.Error as e:
+        __error('Unable to read the snapshot %s: %s' % (
+            __snapshot_path or snapshot.get_default_snapshot_path(), e
+        ))
+    except LookupError as e:
+        __error(e)
+    return iter(())
+
+
+def __find_items(framework, info_type, doc_type, region, command_arg_filter):
+    """
+        Return an iterator over the items of info_type passing the filters,
+        images and servers may come from several regions or the snapshot,
+        with the framework all from all providers
+    """
+    if framework == ALL_PROVIDERS:
+        return __filter_items(
+            __get_all_items(info_type, doc_type, region), command_arg_filter
+        )
+    if info_type not in ('images', 'servers'):
+        regions = [region]
+    elif __snapshot_enabled:
+        return __query_snapshot(
+            framework, info_type, region, doc_type, command_arg_filter
+        )
+    else:
+        regions = __split_regions(region)
+    urls = [
+        __form_url(
+            framework,
+            info_type,
+            region=region_name,
+            image_state=doc_type,
+            apply_filters=command_arg_filter
+        )
+        for region_name in regions
+    ]
+    return __query(urls, info_type, command_arg_filter)
+
+
+def __get_all_items(info_type, doc_type, region):
+    """
+        Query all providers concurrently and yield their items, tagged
+        with the provider, in the order of the providers. The items of a
+        provider are passed on as soon as it and the providers before it
+        answered; a failing provider is reported and skipped as long as
+        at least one provider delivered data.
+    """
+    providers = [provider.name for provider in get_providers()]
+    if not providers:
+        return
+    from concurrent.futures import ThreadPoolExecutor
+    executor = ThreadPoolExecutor(
+        max_workers=min(__max_workers, len(providers))
+    )
+    futures = [
+        executor.submit(
+            __get_provider_items, provider, info_type, doc_type, region
+        )
+        for provider in providers
+    ]
+    failed_providers = []
+    try:
+        for provider, future in zip(providers, futures):
+            try:
+                items = future.result()
+            except (LookupError, ValueError):
+                failed_providers.append(provider)
+                __warn(
+                    "No data retrieved for provider %s, skipping it." %
+                    provider,
+                    sys.stderr
+                )
+                continue
+            for item in items:
+                yield item
+    finally:
+        # the caller may stop reading early
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+    if len(failed_providers) == len(providers):
+        __error("Unable to retrieve data for any of the providers.")
+
+
+def __get_provider_items(framework, info_type, doc_type, region):
+    """Return the items of one provider, tagged with the provider"""
+    items = []
+    for item in __find_items(framework, info_type, doc_type, region, None):
+        tagged = {'provider': framework}
+        tagged.update(item)
+        items.append(tagged)
+    return items
+
+
+def __output(items, info_type, result_format, out=None):
+    """
+        Return the formatted items, or write them to out and return the
+        number of items written
+    """
+    if __timing_hooks:
+        return __timed_output(items, info_type, result_format, out)
+    if out is None:
+        return __reformat(items, info_type, result_format)
+    counter = __Counter(items)
+    for piece in __iter_reformat(counter, info_type, result_format):
+        out.write(piece)
+    return counter.count
+
+
+def __timed_output(items, info_type, result_format, out):
+    """__output, reporting the time spent formatting and writing"""
+    counter = __Counter(items)
+    pieces = __timed(
+        __iter_reformat(counter, info_type, result_format),
+        'format',
+        result_format=result_format
+    )
+    if out is None:
+        return ''.join(pieces)
+    seconds = 0.0
+    for piece in pieces:
+        stage = __enter_stage()
+        out.write(piece)
+        seconds += __leave_stage(stage)
+    __emit('write', seconds=seconds, items=counter.count)
+    return counter.count
+
+
+class __Counter(object):
+    """Pass items through, counting them"""
+
+    def __init__(self, items):
+        self.items = iter(items)
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        item = next(self.items)
+        self.count += 1
+        return item
+
+
+def __emit(stage, **fields):
+    """Pass a timing event to the hooks"""
+    fields['stage'] = stage
+    for hook in list(__timing_hooks):
+        hook(fields)
+
+
+def __enter_stage():
+    """Start timing a stage nested in the one running in this thread"""
+    frames = getattr(__timing_frames, 'frames', None)
+    if frames is None:
+        frames = __timing_frames.frames = []
+    frame = [0.0]
+    frames.append(frame)
+    return frames, frame, time.perf_counter()
+
+
+def __leave_stage(stage):
+    """
+        Stop timing a stage and return its time without the time spent in
+        the stages nested in it
+    """
+    frames, frame, start = stage
+    elapsed = time.perf_counter() - start
+    while frames and frames.pop() is not frame:
+        pass
+    if frames:
+        frames[-1][0] += elapsed
+    return elapsed - frame[0]
+
+
+def __timed(items, stage, size=None, **fields):
+    """
+        Pass items through, timing their production as a stage. Once the
+        items are exhausted an event reports the time, the number of items
+        and, with size, their total size. Callable fields are evaluated
+        then.
+    """
+    items = iter(items)
+    seconds = 0.0
+    count = 0
+    total = 0
+    try:
+        while True:
+            timing = __enter_stage()
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+            finally:
+                seconds += __leave_stage(timing)
+            count += 1
+            if size:
+                total += size(item)
+            yield item
+    finally:
+        for name, value in list(fields.items()):
+            if callable(value):
+                fields[name] = value()
+        if size:
+            fields['bytes'] = total
+        __emit(stage, seconds=seconds, items=count, **fields)
+
+
+def __split_regions(region):
+    """Break down the --region argument into a list of regions"""
+    regions = []
+    for name in (region or 'all').split(','):
+        name = name.strip()
+        if name and name not in regions:
+            regions.append(name)
+    if 'all' in regions or not regions:
+        return ['all']
+    return regions
+
+
+def configure_cache(
+        enabled=True,
+        directory=None,
+        ttl=None,
+        max_size=None,
+        refresh=False,
+        max_stale=None,
+        offline=False):
+    """
+        Enable or disable the on-disk response cache
+
+        Cached responses younger than ttl seconds are used as is, older ones
+        are revalidated with a conditional request. With refresh the cached
+        copies are ignored and replaced by a fresh download.
+
+        Responses older than ttl by at most max_stale seconds are used
+        right away, with a warning, while a background thread refreshes
+        them; they also stand in when the server cannot be reached. With
+        offline the server is never asked and only such responses are
+        used.
+    """
+    global __cache, __cache_refresh, __cache_offline
+    __cache = None
+    __cache_refresh = refresh
+    __cache_offline = offline
+    if enabled:
+        options = {'directory': directory}
+        if ttl is not None:
+            options['ttl'] = ttl
+        if max_size is not None:
+            options['max_size'] = max_size
+        if max_stale is not None:
+            options['max_stale'] = max_stale
+        __cache = ResponseCache(**options)
+
+
+def configure_session(**options):
+    """
+        Replace the HTTP session shared by all requests. Accepted options
+        are pool_size, connect_timeout, read_timeout, retries and
+        backoff_factor.
+    """
+    global __session
+    with __session_lock:
+        if __session is not None:
+            __session.close()
+        from .session import InfoServerSession
+        __session = InfoServerSession(**options)
+
+
+def configure_documents(store=None):
+    """
+        Keep parsed documents in store, an object with get(url) and
+        put(url, info_type, items) returning items, as long as the response
+        cache is enabled. Without a store every document is parsed again.
+    """
+    global __documents
+    __documents = store
+
+
+def configure_memo(enabled=True, ttl=None, max_size=None):
+    """
+        Keep parsed documents, by URL, and the items passing each set of
+        filters, by URL and filters, in memory for ttl seconds, so repeated
+        queries in this process neither parse nor filter again. The least
+        recently used entries are dropped once their estimated size
+        exceeds max_size bytes. Documents kept in the memo are no longer
+        streamed but read completely first.
+    """
+    global __memo
+    __memo = None
+    if enabled:
+        options = {}
+        if ttl is not None:
+            options['ttl'] = ttl
+        if max_size is not None:
+            options['max_size'] = max_size
+        __memo = Memo(**options)
+
+
+def get_memo_stats():
+    """
+        Return the entries, estimated size in bytes, max_size, hits, misses
+        and evictions of the memo as a dict, or None without the memo
+    """
+    memo = __memo
+    return memo and memo.stats()
+
+
+def add_timing_hook(hook):
+    """
+        Call hook with a dict for each timed stage of a query. Every event
+        has the stage and most have the seconds spent in it, without the
+        time of the stages nested in it:
+
+        request   the request up to the response headers, url, status and
+                  server_seconds, the time the response took to arrive
+        cache     the answer of the response cache, the document store or
+                  the memo for url, result is hit, revalidated, miss,
+                  memory, stale (used past its TTL), fallback (used as
+                  the request failed) or shared (fetched by another
+                  thread asking for the same document at the same time)
+        download  reading the body, url, bytes, items (chunks) and
+                  source, server or cache; from the server also the
+                  Content-Encoding and the bytes transferred before
+                  decompression
+        parse     url and items parsed
+        filter    filter, items_in and items let through
+        format    result_format and items (pieces of output)
+        write     writing the output, items written
+
+        Hooks may be called from the threads fetching regions concurrently.
+    """
+    if hook not in __timing_hooks:
+        __timing_hooks.append(hook)
+
+
+def remove_timing_hook(hook):
+    """Stop calling a hook added with add_timing_hook"""
+    if hook in __timing_hooks:
+        __timing_hooks.remove(hook)
+
+
+def call_quietly(function, *args, **kwargs):
+    """
+        Call function without writing warnings and errors from this thread,
+        errors are still raised. For work in the background the user did
+        not ask for.
+    """
+    quiet = getattr(__quiet, 'enabled', False)
+    __quiet.enabled = True
+    try:
+        return function(*args, **kwargs)
+    finally:
+        __quiet.enabled = quiet
+
+
+def run_in_background(name, function, *args):
+    """
+        Call function in a daemon thread. On exit pint waits a moment for
+        such threads to finish, one still running after that, waiting on
+        a slow or unreachable server, is abandoned.
+    """
+    thread = threading.Thread(
+        target=function, args=args, name=name, daemon=True
+    )
+    with __refreshing_lock:
+        __background[:] = [
+            running for running in __background if running.is_alive()
+        ]
+        __background.append(thread)
+        thread.start()
+    return thread
+
+
+def __finish_background():
+    """Give the threads started by run_in_background a moment to finish"""
+    deadline = time.monotonic() + __background_grace
+    with __refreshing_lock:
+        threads = list(__background)
+    for thread in threads:
+        thread.join(max(0, deadline - time.monotonic()))
+
+
+atexit.register(__finish_background)
+
+
+def configure_concurrency(max_workers=8):
+    """Limit the number of documents fetched at the same time"""
+    global __max_workers
+    __max_workers = max_workers
+
+
+def configure_snapshot(enabled=True, path=None):
+    """
+        Answer image and server queries from the local snapshot database
+        written by snapshot.sync_snapshot instead of asking the server
+    """
+    global __snapshot_enabled, __snapshot_path
+    __snapshot_enabled = enabled
+    __snapshot_path = path
+
+
+def reset_configuration():
+    """
+        Return to the defaults of configure_cache, configure_concurrency,
+        configure_snapshot and configure_memo and remove all timing hooks.
+        The session and the document store are kept.
+    """
+    configure_cache(enabled=False)
+    configure_concurrency()
+    configure_snapshot(enabled=False)
+    configure_memo(enabled=False)
+    del __timing_hooks[:]
 
 
 def get_provider_data(
@@ -308,18 +1324,20 @@ def get_provider_data(
         type,
         result_format='plain',
         region='all',
-        command_arg_filter=None):
-    """Return the requested providers information"""
-    info_type = 'providers'
-    url = __form_url(
-        framework,
-        info_type,
+        command_arg_filter=None,
+        out=None):
+    """
+        Return the requested providers information, or stream it to out and
+        return the number of items written
+    """
+    return __output(
+        __find_items(
+            framework, 'providers', type, region, command_arg_filter
+        ),
+        'providers',
         result_format,
-        region,
-        type,
-        apply_filters=command_arg_filter
+        out
     )
-    return __process(url, info_type, command_arg_filter, result_format)
 
 
 def get_image_states_data(
@@ -327,18 +1345,18 @@ def get_image_states_data(
         type,
         result_format='plain',
         region='all',
-        command_arg_filter=None):
-    """Return the requested image states information"""
-    info_type = 'states'
-    url = __form_url(
-        framework,
-        info_type,
+        command_arg_filter=None,
+        out=None):
+    """
+        Return the requested image states information, or stream it to out and
+        return the number of items written
+    """
+    return __output(
+        __find_items(framework, 'states', type, region, command_arg_filter),
+        'states',
         result_format,
-        region,
-        type,
-        apply_filters=command_arg_filter
+        out
     )
-    return __process(url, info_type, command_arg_filter, result_format)
 
 
 def get_server_types_data(
@@ -346,18 +1364,18 @@ def get_server_types_data(
         type,
         result_format='plain',
         region='all',
-        command_arg_filter=None):
-    """Return the requested server types information"""
-    info_type = 'types'
-    url = __form_url(
-        framework,
-        info_type,
+        command_arg_filter=None,
+        out=None):
+    """
+        Return the requested server types information, or stream it to out and
+        return the number of items written
+    """
+    return __output(
+        __find_items(framework, 'types', type, region, command_arg_filter),
+        'types',
         result_format,
-        region,
-        type,
-        apply_filters=command_arg_filter
+        out
     )
-    return __process(url, info_type, command_arg_filter, result_format)
 
 
 def get_regions_data(
@@ -365,18 +1383,18 @@ def get_regions_data(
         type,
         result_format='plain',
         region='all',
-        command_arg_filter=None):
-    """Return the requested regions information"""
-    info_type = 'regions'
-    url = __form_url(
-        framework,
-        info_type,
+        command_arg_filter=None,
+        out=None):
+    """
+        Return the requested regions information, or stream it to out and
+        return the number of items written
+    """
+    return __output(
+        __find_items(framework, 'regions', type, region, command_arg_filter),
+        'regions',
         result_format,
-        region,
-        type,
-        apply_filters=command_arg_filter
+        out
     )
-    return __process(url, info_type, command_arg_filter, result_format)
 
 
 def get_image_data(
@@ -384,18 +1402,20 @@ def get_image_data(
         image_state,
         result_format='plain',
         region='all',
-        command_arg_filter=None):
-    """Return the requested image information"""
-    info_type = 'images'
-    url = __form_url(
-        framework,
-        info_type,
+        command_arg_filter=None,
+        out=None):
+    """
+        Return the requested image information, or stream it to out and
+        return the number of items written
+    """
+    return __output(
+        __find_items(
+            framework, 'images', image_state, region, command_arg_filter
+        ),
+        'images',
         result_format,
-        region,
-        image_state,
-        apply_filters=command_arg_filter
+        out
     )
-    return __process(url, info_type, command_arg_filter, result_format)
 
 
 def get_server_data(
@@ -403,15 +1423,130 @@ def get_server_data(
         server_type,
         result_format='plain',
         region='all',
+        command_arg_filter=None,
+        out=None):
+    """
+        Return the requested server information, or stream it to out and
+        return the number of items written
+    """
+    return __output(
+        __find_items(
+            framework, 'servers', server_type, region, command_arg_filter
+        ),
+        'servers',
+        result_format,
+        out
+    )
+
+
+def get_providers(command_arg_filter=None):
+    """Return the providers as a list of Provider records"""
+    return [
+        Provider(item) for item in
+        __find_items(None, 'providers', None, 'all', command_arg_filter)
+    ]
+
+
+def get_image_states(command_arg_filter=None):
+    """Return the image states as a list of ImageState records"""
+    return [
+        ImageState(item) for item in
+        __find_items(None, 'states', None, 'all', command_arg_filter)
+    ]
+
+
+def get_server_types(framework, command_arg_filter=None):
+    """Return the server types of framework as ServerType records"""
+    return [
+        ServerType(item) for item in
+        __find_items(framework, 'types', None, 'all', command_arg_filter)
+    ]
+
+
+def get_regions(framework, command_arg_filter=None):
+    """Return the regions of framework as a list of Region records"""
+    return [
+        Region(item) for item in
+        __find_items(framework, 'regions', None, 'all', command_arg_filter)
+    ]
+
+
+def get_images(
+        framework,
+        image_state=None,
+        region='all',
         command_arg_filter=None):
-    """Return the requested server information"""
-    info_type = 'servers'
-    url = __form_url(
+    """Return the requested images as a list of Image records"""
+    return [
+        Image(item) for item in __find_items(
+            framework, 'images', image_state, region, command_arg_filter
+        )
+    ]
+
+
+def get_servers(
         framework,
-        info_type,
-        result_format,
-        region,
-        server_type=server_type,
-        apply_filters=command_arg_filter
+        server_type=None,
+        region='all',
+        command_arg_filter=None):
+    """Return the requested servers as a list of Server records"""
+    return [
+        Server(item) for item in __find_items(
+            framework, 'servers', server_type, region, command_arg_filter
+        )
+    ]
+
+
+def get_image_columns(
+        framework,
+        image_state=None,
+        region='all',
+        command_arg_filter=None):
+    """
+        Return the requested images as a ColumnSet, which takes a fraction
+        of the memory of records for large results
+    """
+    from .columnar import ColumnSet
+    return ColumnSet(
+        __find_items(
+            framework, 'images', image_state, region, command_arg_filter
+        ),
+        'images'
+    )
+
+
+def get_image_index(
+        framework,
+        image_state=None,
+        region='all',
+        command_arg_filter=None):
+    """
+        Return an ImageIndex over the requested images for exact lookups
+        by id, replacementid and name
+    """
+    from .lookup import ImageIndex
+    return ImageIndex(
+        get_images(framework, image_state, region, command_arg_filter)
+    )
+
+
+def get_server_index(
+        framework,
+        server_type=None,
+        region='all',
+        command_arg_filter=None):
+    """Return a ServerIndex over the requested servers for lookups by ip"""
+    from .lookup import ServerIndex
+    return ServerIndex(
+        get_servers(framework, server_type, region, command_arg_filter)
+    )
+
+
+def format_records(records, info_type, result_format='plain', out=None):
+    """
+        Format records returned by the get_* functions like the get_*_data
+        functions do, or write them to out and return their number
+    """
+    return __output(
+        (record._data for record in records), info_type, result_format, out
     )
-    return __process(url, info_type, command_arg_filter, result_format)
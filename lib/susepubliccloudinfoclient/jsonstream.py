@@ -0,0 +1,111 @@
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+import json
+
+WHITESPACE = ' \t\n\r'
+
+
+class _Reader(object):
+    """A text buffer over an iterator of chunks, refilled on demand"""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.buffer = ''
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def fill(self):
+        """Append the next chunk, return False once the input is exhausted"""
+        for chunk in self.chunks:
+            self.buffer = self.buffer[self.pos:] + chunk
+            self.pos = 0
+            return True
+        return False
+
+    def peek(self):
+        """Return the next non whitespace character without consuming it"""
+        while True:
+            buffer = self.buffer
+            pos = self.pos
+            while pos < len(buffer) and buffer[pos] in WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, characters):
+        """Consume and return the next character if it is one of characters"""
+        character = self.peek()
+        if not character or character not in characters:
+            raise json.JSONDecodeError(
+                'Expecting one of %r' % characters, self.buffer, self.pos
+            )
+        self.pos += 1
+        return character
+
+    def value(self):
+        """Decode and return the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # a number or literal at the end of the buffer may continue
+            # in the next chunk
+            if end == len(self.buffer) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_array_items(chunks, key):
+    """
+        Yield the items of the array stored under key in the top level
+        object of a JSON document given as an iterator of text chunks.
+        Only one item is decoded at a time. Like indexing the decoded
+        document, a missing key raises KeyError and malformed input
+        raises ValueError.
+    """
+    reader = _Reader(chunks)
+    reader.expect('{')
+    if reader.peek() == '}':
+        raise KeyError(key)
+    while True:
+        name = reader.value()
+        reader.expect(':')
+        if name == key:
+            break
+        # not what we are after, decode and drop it
+        reader.value()
+        if reader.expect(',}') == '}':
+            raise KeyError(key)
+    reader.expect('[')
+    if reader.peek() == ']':
+        return
+    while True:
+        yield reader.value()
+        if reader.expect(',]') == ']':
+            return
@@ -0,0 +1,91 @@
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+IMAGE_INDEX_ATTRS = ('id', 'replacementid', 'name')
+SERVER_INDEX_ATTRS = ('ip', 'name')
+
+# Images in these states are not replaced any further
+FINAL_STATES = ('active',)
+
+
+class ItemIndex(object):
+    """
+        Hash indexes on some attributes of a set of items, records or
+        dicts, built once for any number of exact lookups
+    """
+
+    def __init__(self, items, attrs):
+        self.items = list(items)
+        self.indexes = dict((attr, {}) for attr in attrs)
+        for item in self.items:
+            for attr, index in self.indexes.items():
+                value = item.get(attr)
+                if value:
+                    index.setdefault(value, []).append(item)
+
+    def __len__(self):
+        return len(self.items)
+
+    def lookup(self, attr, value):
+        """Return the items with the attribute set to value"""
+        return list(self.indexes[attr].get(value, ()))
+
+    def lookup_many(self, attr, values):
+        """Return the items matching any of values, in the order of values"""
+        index = self.indexes[attr]
+        items = []
+        for value in values:
+            items.extend(index.get(value, ()))
+        return items
+
+
+class ImageIndex(ItemIndex):
+
+    def __init__(self, images):
+        super(ImageIndex, self).__init__(images, IMAGE_INDEX_ATTRS)
+
+    def resolve_replacement(self, image):
+        """
+            Follow the replacementid of image until an active image or the
+            end of the chain, as far as the images of the index reach.
+            Replacements in the same region are preferred.
+        """
+        seen = set()
+        while image.get('state') not in FINAL_STATES:
+            replacement_id = image.get('replacementid')
+            if not replacement_id or replacement_id in seen:
+                break
+            seen.add(replacement_id)
+            replacements = self.lookup('id', replacement_id)
+            if not replacements:
+                break
+            for replacement in replacements:
+                if replacement.get('region') == image.get('region'):
+                    image = replacement
+                    break
+            else:
+                image = replacements[0]
+        return image
+
+
+class ServerIndex(ItemIndex):
+
+    def __init__(self, servers):
+        super(ServerIndex, self).__init__(servers, SERVER_INDEX_ATTRS)
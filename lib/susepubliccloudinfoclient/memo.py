@@ -0,0 +1,115 @@
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+import collections
+import sys
+import threading
+import time
+
+DEFAULT_TTL = 300
+DEFAULT_MAX_SIZE = 128 * 1024 * 1024
+
+
+def estimate_size(items):
+    """
+        Estimate the bytes held by a list of items, dicts of strings as
+        parsed from the server. Keys are shared between the items of a
+        document and counted once.
+    """
+    size = sys.getsizeof(items)
+    keys = set()
+    for item in items:
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            for key, value in item.items():
+                if key not in keys:
+                    keys.add(key)
+                    size += sys.getsizeof(key)
+                size += sys.getsizeof(value)
+    return size
+
+
+class Memo(object):
+    """
+        Size bounded in-memory store for parsed items, keyed by anything
+        hashable. Entries expire ttl seconds after they were stored and
+        the least recently used ones are dropped once the estimated size
+        of all entries exceeds max_size. Items shared by several entries
+        are counted for each of them.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, max_size=DEFAULT_MAX_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Return the items stored for key, or None"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and time.monotonic() - entry[1] > self.ttl:
+                self.__drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, items):
+        """Store items for key, a list too big for the memo is not kept"""
+        size = estimate_size(items)
+        with self.lock:
+            if key in self.entries:
+                self.__drop(key)
+            if size <= self.max_size:
+                self.entries[key] = (items, time.monotonic(), size)
+                self.size += size
+                while self.size > self.max_size:
+                    self.__drop(next(iter(self.entries)))
+                    self.evictions += 1
+        return items
+
+    def clear(self):
+        """Remove all entries"""
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self):
+        """Return the number of entries, their size, hits and misses"""
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'size': self.size,
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+    def __drop(self, key):
+        self.size -= self.entries.pop(key)[2]
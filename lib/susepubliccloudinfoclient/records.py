@@ -0,0 +1,110 @@
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+
+class Record(object):
+    """
+        Read only view of one item of a server response. The attributes
+        are the keys of the item, the listed fields read as None when the
+        server left them out.
+    """
+    __slots__ = ('_data',)
+    info_type = None
+    fields = ()
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getattr__(self, name):
+        # copy and pickle look up special names before _data is set
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self._data[name]
+        except KeyError:
+            if name in self.fields:
+                return None
+            raise AttributeError(name)
+
+    def __getitem__(self, name):
+        return self._data[name]
+
+    def __contains__(self, name):
+        return name in self._data
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._data == other._data
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, self._data)
+
+    def get(self, name, default=None):
+        return self._data.get(name, default)
+
+    def keys(self):
+        return self._data.keys()
+
+    def as_dict(self):
+        """Return a copy of the item as a dict"""
+        return dict(self._data)
+
+
+class Image(Record):
+    __slots__ = ()
+    info_type = 'images'
+    fields = (
+        'id', 'name', 'state', 'region', 'replacementid', 'replacementname',
+        'publishedon', 'deprecatedon', 'deletedon'
+    )
+
+
+class Server(Record):
+    __slots__ = ()
+    info_type = 'servers'
+    fields = ('name', 'type', 'ip', 'region')
+
+
+class Region(Record):
+    __slots__ = ()
+    info_type = 'regions'
+    fields = ('name',)
+
+
+class Provider(Record):
+    __slots__ = ()
+    info_type = 'providers'
+    fields = ('name',)
+
+
+class ImageState(Record):
+    __slots__ = ()
+    info_type = 'states'
+    fields = ('name',)
+
+
+class ServerType(Record):
+    __slots__ = ()
+    info_type = 'types'
+    fields = ('name',)
@@ -0,0 +1,270 @@
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+import collections
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+DEFAULT_TTL = 3600
+# How long past the TTL pint uses an entry, see ResponseCache.is_usable
+DEFAULT_MAX_STALE = 24 * 3600
+DEFAULT_MAX_SIZE = 100 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+CacheEntry = collections.namedtuple(
+    'CacheEntry',
+    ['url', 'body', 'etag', 'last_modified', 'stored', 'size']
+)
+
+
+def get_default_cache_dir():
+    """Return the directory used for cached responses"""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache'
+    )
+    return os.path.join(cache_home, 'pint', 'responses')
+
+
+class ResponseCache(object):
+    """
+        Size bounded on-disk store for server responses, keyed by URL.
+
+        Every entry is kept as a body file plus a small JSON metadata file
+        holding the validators (ETag, Last-Modified) and the time the body
+        was last confirmed by the server. The modification time of the
+        metadata file tracks the last access and drives LRU eviction.
+
+        Entries older than the TTL by at most max_stale seconds remain
+        usable when the server is not to be asked or cannot be reached.
+    """
+
+    def __init__(
+            self,
+            directory=None,
+            ttl=DEFAULT_TTL,
+            max_size=DEFAULT_MAX_SIZE,
+            max_stale=0):
+        self.directory = directory or get_default_cache_dir()
+        self.ttl = ttl
+        self.max_size = max_size
+        self.max_stale = max_stale
+
+    def lookup(self, url, load_body=True):
+        """
+            Return the cached entry for url or None. Without load_body the
+            entry carries no body, use iter_body to read it.
+        """
+        meta_path, body_path = self.__paths(url)
+        try:
+            with open(meta_path, 'r') as meta_file:
+                meta = json.load(meta_file)
+            if load_body:
+                with open(body_path, 'rb') as body_file:
+                    body = body_file.read()
+                size = len(body)
+            else:
+                body = None
+                size = os.stat(body_path).st_size
+        except (OSError, ValueError):
+            return None
+        if meta.get('url') != url or meta.get('size') != size:
+            return None
+        self.__touch(meta_path)
+        return CacheEntry(
+            url,
+            body,
+            meta.get('etag'),
+            meta.get('last_modified'),
+            meta.get('stored', 0),
+            size
+        )
+
+    def iter_body(self, entry, chunk_size=CHUNK_SIZE):
+        """Yield the cached body of entry in chunks"""
+        if entry.body is not None:
+            yield entry.body
+            return
+        with open(self.__paths(entry.url)[1], 'rb') as body_file:
+            while True:
+                chunk = body_file.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def is_fresh(self, entry):
+        """Whether the entry may be used without asking the server"""
+        return self.age(entry) < self.ttl
+
+    def is_usable(self, entry):
+        """Whether the entry may be used, stale, instead of asking again"""
+        return self.age(entry) <= self.ttl + self.max_stale
+
+    def age(self, entry):
+        """Seconds since the entry was last confirmed by the server"""
+        return max(0, time.time() - entry.stored)
+
+    def store(self, url, body, etag=None, last_modified=None):
+        """Add or replace the entry for url"""
+        for chunk in self.store_chunks(url, [body], etag, last_modified):
+            pass
+
+    def store_chunks(self, url, chunks, etag=None, last_modified=None):
+        """
+            Pass the chunks through while writing them to the entry for
+            url. The entry is only replaced once all chunks were consumed.
+        """
+        meta_path, body_path = self.__paths(url)
+        tmp_file = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.directory, suffix='.tmp'
+            )
+            tmp_file = os.fdopen(fd, 'wb')
+        except OSError:
+            # A cache that cannot be written is not worth failing over
+            pass
+        size = 0
+        try:
+            for chunk in chunks:
+                if tmp_file:
+                    try:
+                        tmp_file.write(chunk)
+                    except OSError:
+                        tmp_file.close()
+                        self.__remove(tmp_path)
+                        tmp_file = None
+                size += len(chunk)
+                yield chunk
+        except BaseException:
+            if tmp_file:
+                tmp_file.close()
+                self.__remove(tmp_path)
+            raise
+        if not tmp_file:
+            return
+        meta = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored': time.time(),
+            'size': size
+        }
+        try:
+            tmp_file.close()
+            os.replace(tmp_path, body_path)
+            self.__write(meta_path, json.dumps(meta).encode())
+            self.__touch(meta_path)
+        except OSError:
+            self.__remove(tmp_path)
+            return
+        self.__evict()
+
+    def revalidated(self, url, entry):
+        """Record that the server confirmed the entry is still current"""
+        meta_path = self.__paths(url)[0]
+        meta = {
+            'url': url,
+            'etag': entry.etag,
+            'last_modified': entry.last_modified,
+            'stored': time.time(),
+            'size': entry.size
+        }
+        try:
+            self.__write(meta_path, json.dumps(meta).encode())
+        except OSError:
+            pass
+        return entry._replace(stored=meta['stored'])
+
+    def clear(self):
+        """Remove all entries"""
+        for meta_path, body_path, size, accessed in self.__entries():
+            self.__remove(meta_path, body_path)
+
+    def __entries(self):
+        """Return (meta path, body path, size, last access) for all entries"""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            meta_path = os.path.join(self.directory, name)
+            body_path = meta_path[:-len('.json')] + '.body'
+            try:
+                accessed = os.stat(meta_path).st_mtime
+                size = os.stat(body_path).st_size
+            except OSError:
+                size = 0
+                accessed = 0
+            entries.append((meta_path, body_path, size, accessed))
+        return entries
+
+    def __evict(self):
+        """Drop the least recently used entries until under max_size"""
+        entries = self.__entries()
+        total = sum(entry[2] for entry in entries)
+        if total <= self.max_size:
+            return
+        # keep the most recently used entry even if it alone is too big
+        entries.sort(key=lambda entry: entry[3])
+        for meta_path, body_path, size, accessed in entries[:-1]:
+            self.__remove(meta_path, body_path)
+            total -= size
+            if total <= self.max_size:
+                break
+
+    def __paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + '.json', base + '.body'
+
+    @staticmethod
+    def __remove(*paths):
+        for path in paths:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def __touch(path):
+        # explicit times, the file system clock may be too coarse for LRU
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+
+    def __write(self, path, data):
+        """Atomically replace path with data"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            self.__remove(tmp_path)
+            raise
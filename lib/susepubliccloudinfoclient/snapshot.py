@@ -0,0 +1,399 @@
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from . import infoserverrequests as ifsrequest
+from .responsecache import get_default_cache_dir
+
+# Indexed columns per information type, the complete item is kept as JSON
+COLUMNS = {
+    'images': (
+        'region', 'state', 'name', 'id', 'replacementid', 'replacementname',
+        'publishedon', 'deprecatedon', 'deletedon'
+    ),
+    'servers': ('region', 'type', 'name', 'ip')
+}
+
+# Image states in which an image can still change, deleted is final
+LIVE_IMAGE_STATES = ('active', 'inactive', 'deprecated')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS images (
+    provider TEXT NOT NULL,
+    region TEXT,
+    state TEXT,
+    name TEXT,
+    id TEXT,
+    replacementid TEXT,
+    replacementname TEXT,
+    publishedon TEXT,
+    deprecatedon TEXT,
+    deletedon TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS images_location
+    ON images (provider, region, state);
+CREATE INDEX IF NOT EXISTS images_state ON images (provider, state);
+CREATE INDEX IF NOT EXISTS images_name ON images (name);
+CREATE INDEX IF NOT EXISTS images_id ON images (id);
+CREATE INDEX IF NOT EXISTS images_publishedon
+    ON images (provider, publishedon);
+CREATE TABLE IF NOT EXISTS servers (
+    provider TEXT NOT NULL,
+    region TEXT,
+    type TEXT,
+    name TEXT,
+    ip TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS servers_location
+    ON servers (provider, region, type);
+CREATE INDEX IF NOT EXISTS servers_ip ON servers (ip);
+CREATE TABLE IF NOT EXISTS synced (
+    provider TEXT PRIMARY KEY,
+    synced REAL NOT NULL
+);
+'''
+
+__connections = threading.local()
+
+
+def get_default_snapshot_path():
+    """Return the location of the snapshot database"""
+    return os.path.join(
+        os.path.dirname(get_default_cache_dir()), 'snapshot.db'
+    )
+
+
+def get_snapshot_age(framework=None, path=None):
+    """
+        Return the age in seconds of the snapshot for framework, or of the
+        oldest provider snapshot, or None if there is none.
+    """
+    connection = __connect(path)
+    if framework:
+        row = connection.execute(
+            'SELECT synced FROM synced WHERE provider = ?', (framework,)
+        ).fetchone()
+    else:
+        row = connection.execute('SELECT MIN(synced) FROM synced').fetchone()
+    if not row or row[0] is None:
+        return None
+    return max(0, time.time() - row[0])
+
+
+def query_snapshot(
+        framework,
+        info_type,
+        regions=None,
+        doc_type=None,
+        filters=None,
+        path=None):
+    """
+        Yield the items of info_type for framework stored in the snapshot,
+        restricted to the regions (None for all) and image state or server
+        type. Filters as returned by __parse_command_arg_filter are
+        evaluated by the database where possible.
+    """
+    connection = __connect(path)
+    if get_snapshot_age(framework, path) is None:
+        raise LookupError(
+            "No snapshot of '%s' available, run 'pint sync' first." %
+            framework
+        )
+    conditions = ['provider = ?']
+    parameters = [framework]
+    if regions:
+        # items without a region are not tied to one and always apply
+        conditions.append(
+            '(region IS NULL OR region IN (%s))' %
+            ', '.join('?' * len(regions))
+        )
+        parameters.extend(regions)
+    if doc_type and info_type == 'images':
+        conditions.append('state = ?')
+        parameters.append(doc_type)
+    elif doc_type:
+        conditions.append("(type = ? OR type LIKE ? || '-%')")
+        parameters.extend([doc_type, doc_type])
+    remaining_filters = []
+    for a_filter in filters or []:
+        condition = __filter_condition(info_type, a_filter)
+        if condition:
+            conditions.append(condition)
+            parameters.append(__filter_parameter(a_filter))
+        else:
+            remaining_filters.append(a_filter)
+    rows = connection.execute(
+        'SELECT data FROM %s WHERE %s ORDER BY rowid' % (
+            info_type, ' AND '.join(conditions)
+        ),
+        parameters
+    )
+    items = (json.loads(row[0]) for row in rows)
+    if remaining_filters:
+        items = filter(
+            ifsrequest.__compile_filters(remaining_filters), items
+        )
+    return items
+
+
+def sync_snapshot(providers=None, path=None):
+    """
+        Download all images and servers of the given providers, or of all
+        providers the server knows about, into the snapshot. Returns the
+        number of stored items per provider and information type.
+    """
+    if providers is None:
+        providers = [
+            provider.name for provider in ifsrequest.get_providers()
+        ]
+    connection = __connect(path)
+    counts = {}
+    for provider in providers:
+        counts[provider] = {}
+        with connection:
+            for info_type in COLUMNS:
+                counts[provider][info_type] = store_items(
+                    connection,
+                    provider,
+                    info_type,
+                    ifsrequest.__iter_document_items(
+                        ifsrequest.__form_url(provider, info_type),
+                        info_type
+                    )
+                )
+            connection.execute(
+                'INSERT OR REPLACE INTO synced VALUES (?, ?)',
+                (provider, time.time())
+            )
+    return counts
+
+
+def update_snapshot(providers=None, path=None):
+    """
+        Bring the images in the snapshot up to date by fetching only the
+        documents of the states in which images still change, and yield
+        the differences as change events. Each event is a dict with the
+        event type, the provider and the image:
+
+        added: the image is new
+        updated: attributes changed, the image kept its state
+        transitioned: the image changed its state, including to deleted
+        removed: the image vanished without a trace in deleted.json
+
+        All but added events carry the stored image as previous. The
+        deleted document is only requested when images left the live
+        states. Without providers the ones in the snapshot are updated.
+    """
+    connection = __connect(path)
+    if providers is None:
+        providers = [
+            row[0] for row in connection.execute(
+                'SELECT provider FROM synced ORDER BY provider'
+            )
+        ]
+    for provider in providers:
+        for event in __update_provider(connection, provider):
+            yield event
+
+
+def __update_provider(connection, provider):
+    """Apply and return the change events for the images of provider"""
+    current = {}
+    for state in LIVE_IMAGE_STATES:
+        for item in __fetch_images(provider, state):
+            current[__image_key(item)] = item
+    stored = {}
+    for rowid, data in connection.execute(
+            'SELECT rowid, data FROM images WHERE provider = ? AND '
+            'state IN (%s) ORDER BY rowid' % ', '.join(
+                '?' * len(LIVE_IMAGE_STATES)
+            ),
+            (provider,) + LIVE_IMAGE_STATES):
+        item = json.loads(data)
+        stored[__image_key(item)] = (rowid, item)
+    events = []
+    changes = []
+    for key, item in current.items():
+        rowid, previous = stored.pop(key, (None, None))
+        if previous is None:
+            events.append(__event('added', provider, item))
+        elif previous.get('state') != item.get('state'):
+            events.append(__event('transitioned', provider, item, previous))
+        elif previous != item:
+            events.append(__event('updated', provider, item, previous))
+        else:
+            continue
+        changes.append((rowid, item))
+    if stored:
+        # images left the live states, look up their final record
+        deleted = dict(
+            (__image_key(item), item)
+            for item in __fetch_images(provider, 'deleted')
+            if __image_key(item) in stored
+        )
+        for key, (rowid, previous) in stored.items():
+            item = deleted.get(key)
+            if item:
+                events.append(
+                    __event('transitioned', provider, item, previous)
+                )
+            else:
+                events.append(
+                    __event('removed', provider, previous, previous)
+                )
+            changes.append((rowid, item))
+    columns = COLUMNS['images']
+    with connection:
+        for rowid, item in changes:
+            if item is None:
+                connection.execute(
+                    'DELETE FROM images WHERE rowid = ?', (rowid,)
+                )
+                continue
+            values = tuple(item.get(column) for column in columns) + (
+                json.dumps(item),
+            )
+            if rowid is None:
+                connection.execute(
+                    'INSERT INTO images (provider, %s, data) '
+                    'VALUES (?, %s, ?)' % (
+                        ', '.join(columns), ', '.join('?' * len(columns))
+                    ),
+                    (provider,) + values
+                )
+            else:
+                connection.execute(
+                    'UPDATE images SET %s, data = ? WHERE rowid = ?' % (
+                        ', '.join('%s = ?' % column for column in columns)
+                    ),
+                    values + (rowid,)
+                )
+        connection.execute(
+            'INSERT OR REPLACE INTO synced VALUES (?, ?)',
+            (provider, time.time())
+        )
+    return events
+
+
+def __event(event_type, provider, image, previous=None):
+    event = {'event': event_type, 'provider': provider, 'image': image}
+    if previous is not None:
+        event['previous'] = previous
+    return event
+
+
+def __fetch_images(provider, state):
+    return ifsrequest.__iter_document_items(
+        ifsrequest.__form_url(provider, 'images', image_state=state),
+        'images'
+    )
+
+
+def __image_key(item):
+    """Images are identified by their id, or name, within their region"""
+    return (item.get('region'), item.get('id') or item.get('name'))
+
+
+def store_items(connection, provider, info_type, items):
+    """Replace the stored items of info_type for provider"""
+    columns = COLUMNS[info_type]
+    connection.execute(
+        'DELETE FROM %s WHERE provider = ?' % info_type, (provider,)
+    )
+    cursor = connection.executemany(
+        'INSERT INTO %s (provider, %s, data) VALUES (?, %s, ?)' % (
+            info_type, ', '.join(columns), ', '.join('?' * len(columns))
+        ),
+        (
+            (provider, *[item.get(column) for column in columns],
+             json.dumps(item))
+            for item in items
+        )
+    )
+    return cursor.rowcount
+
+
+def __connect(path=None):
+    """Return this thread's connection to the snapshot at path"""
+    path = path or get_default_snapshot_path()
+    connections = getattr(__connections, 'by_path', None)
+    if connections is None:
+        connections = __connections.by_path = {}
+    connection = connections.get(path)
+    if connection is None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(path)
+        connection.executescript(SCHEMA)
+        connection.create_function(
+            'pint_match', 2, __regex_match, deterministic=True
+        )
+        connections[path] = connection
+    return connection
+
+
+def __filter_condition(info_type, a_filter):
+    """Return the SQL condition for a filter or None if there is none"""
+    attr = a_filter['attr']
+    if attr not in COLUMNS[info_type]:
+        return None
+    operator = a_filter['operator']
+    if operator == '=':
+        return '%s = ?' % attr
+    elif operator == '~':
+        return 'instr(lower(%s), ?) > 0' % attr
+    elif operator == '!':
+        return 'instr(lower(%s), ?) = 0' % attr
+    elif operator == '%':
+        return 'pint_match(?, %s)' % attr
+    # dates that are not set never match a comparison
+    elif operator == '>':
+        return "(%s != '' AND CAST(%s AS INTEGER) > ?)" % (attr, attr)
+    elif operator == '<':
+        return "(%s != '' AND CAST(%s AS INTEGER) < ?)" % (attr, attr)
+
+
+def __filter_parameter(a_filter):
+    if a_filter['operator'] in '~!%':
+        return a_filter['value'].lower()
+    elif a_filter['operator'] in '<>':
+        return int(a_filter['value'])
+    return a_filter['value']
+
+
+__patterns = {}
+
+
+def __regex_match(pattern, value):
+    if value is None:
+        return False
+    regex = __patterns.get(pattern)
+    if regex is None:
+        regex = __patterns[pattern] = re.compile(pattern)
+    return regex.match(value.lower()) is not None
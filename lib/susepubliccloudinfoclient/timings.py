@@ -0,0 +1,120 @@
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+import json
+import threading
+import time
+
+# The stages of a query in the order the data passes them
+STAGES = ('request', 'download', 'parse', 'filter', 'format', 'write')
+
+
+class Timings(object):
+    """
+        Timing hook for infoserverrequests.add_timing_hook collecting the
+        events of one or more queries and summing them up per stage
+    """
+
+    def __init__(self):
+        self.events = []
+        self.lock = threading.Lock()
+        self.start = time.perf_counter()
+
+    def __call__(self, event):
+        with self.lock:
+            self.events.append(event)
+
+    def summary(self):
+        """Return the totals of the events collected so far as a dict"""
+        with self.lock:
+            events = list(self.events)
+        summary = {
+            'seconds': time.perf_counter() - self.start,
+            'stages': dict((stage, 0.0) for stage in STAGES),
+            'requests': 0,
+            'server_seconds': 0.0,
+            'bytes': 0,
+            'transferred': 0,
+            'items': 0,
+            'cache': {},
+            'filters': []
+        }
+        for event in events:
+            stage = event['stage']
+            if stage == 'cache':
+                result = event['result']
+                summary['cache'][result] = summary['cache'].get(result, 0) + 1
+                continue
+            summary['stages'][stage] += event.get('seconds', 0.0)
+            if stage == 'request':
+                summary['requests'] += 1
+                summary['server_seconds'] += event.get('server_seconds', 0.0)
+            elif stage == 'download':
+                summary['bytes'] += event['bytes']
+                if event['source'] == 'server':
+                    summary['transferred'] += (
+                        event.get('transferred') or event['bytes']
+                    )
+            elif stage == 'parse':
+                summary['items'] += event['items']
+            elif stage == 'filter':
+                summary['filters'].append({
+                    'filter': event['filter'],
+                    'items_in': event['items_in'],
+                    'items_out': event['items'],
+                    'seconds': event['seconds']
+                })
+        return summary
+
+    def format(self, result_format='plain'):
+        """Return the summary as text or, with json, as a JSON object"""
+        summary = self.summary()
+        if result_format == 'json':
+            return json.dumps(summary, sort_keys=True)
+        stages = summary['stages']
+        lines = ['Timings:', '  %-9s %8.3fs' % ('total', summary['seconds'])]
+        notes = {
+            'request': '%d requests, %.3fs waiting for the server' % (
+                summary['requests'], summary['server_seconds']
+            ),
+            'download': '%d bytes, %d transferred' % (
+                summary['bytes'], summary['transferred']
+            ),
+            'parse': '%d items' % summary['items']
+        }
+        for stage in STAGES:
+            line = '  %-9s %8.3fs' % (stage, stages[stage])
+            if stage in notes:
+                line += '  ' + notes[stage]
+            lines.append(line)
+            if stage == 'filter':
+                for a_filter in summary['filters']:
+                    lines.append('    %-20s %8.3fs  %d -> %d items' % (
+                        a_filter['filter'],
+                        a_filter['seconds'],
+                        a_filter['items_in'],
+                        a_filter['items_out']
+                    ))
+        if summary['cache']:
+            lines.append('  %-9s %s' % ('cache', ', '.join(
+                '%s %d' % (result, count)
+                for result, count in sorted(summary['cache'].items())
+            )))
+        return '\n'.join(lines)
@@ -60,7 +60,9 @@ if __name__ == '__main__':
         version=src_version,
         install_requires=requirements,
         extras_require={
-            'dev': dev_requirements
+            'dev': dev_requirements,
+            'numpy': ['numpy'],
+            'compression': ['brotli', 'zstandard']
         },
         include_package_data=True,
         packages=setuptools.find_packages('lib'),
@@ -0,0 +1,311 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+"""
+Benchmarks of the fetch, parse, filter and format pipeline on synthetic
+images. Timings are stored relative to a calibration loop, so baselines
+recorded on one machine can be compared on another.
+
+Record new baselines from the repository root with
+
+  python -m test.benchmark.suite --save
+
+and compare against them with
+
+  python -m test.benchmark.suite
+
+or by running test/benchmark/test_pipeline_benchmark.py. The sizes default
+to 1k and 100k images, set PINT_BENCHMARK_SIZES=1000,100000,1000000 to add
+the 1M run.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import lib.susepubliccloudinfoclient.infoserverrequests as ifsrequest
+from lib.susepubliccloudinfoclient.jsonstream import iter_array_items
+
+from .synthetic import generate_images
+
+DEFAULT_SIZES = (1000, 100000)
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baselines.json')
+
+# Times slower than the baseline a benchmark may get before it counts as
+# a regression, generous as shared machines are noisy
+DEFAULT_TOLERANCE = 2.0
+
+# One filter per operator
+FILTERS = {
+    '=': 'publishedon=20200101',
+    '~': 'name~sles-15',
+    '!': 'name!byos',
+    '%': 'name%suse-sles-15-sp[45].*',
+    '>': 'publishedon>20200101',
+    '<': 'publishedon<20200101'
+}
+FILTER_NAMES = {
+    '=': 'exact', '~': 'substring', '!': 'not_substring', '%': 'regex',
+    '>': 'greater_than', '<': 'less_than'
+}
+
+CHUNK_SIZE = 64 * 1024
+
+
+class Dataset(object):
+    """Synthetic images of one size in the shapes the pipeline sees"""
+
+    def __init__(self, size):
+        self.size = size
+        self.images = generate_images(size)
+        self.document = json.dumps({'images': self.images})
+        self.body = self.document.encode('utf-8')
+        self.httpd = None
+
+    def serve(self):
+        """Serve the document locally and return the base URL"""
+        if self.httpd is None:
+            self.httpd = ThreadingHTTPServer(
+                ('127.0.0.1', 0), _handler(self.body)
+            )
+            threading.Thread(
+                target=self.httpd.serve_forever, daemon=True
+            ).start()
+        return 'http://127.0.0.1:%d' % self.httpd.server_address[1]
+
+    def close(self):
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+
+def _handler(body):
+    """Return a request handler answering every request with body"""
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+    return Handler
+
+
+class _NullOutput(object):
+    """Output that only counts what is written"""
+
+    def __init__(self):
+        self.written = 0
+
+    def write(self, text):
+        self.written += len(text)
+
+
+def __parse(dataset):
+    return json.loads(dataset.document)['images']
+
+
+def __stream_parse(dataset):
+    document = dataset.document
+    chunks = (
+        document[start:start + CHUNK_SIZE]
+        for start in range(0, len(document), CHUNK_SIZE)
+    )
+    return sum(1 for item in iter_array_items(chunks, 'images'))
+
+
+def __filter(operator):
+    predicate = ifsrequest.__compile_filters(
+        ifsrequest.__parse_command_arg_filter(FILTERS[operator], strict=True)
+    )
+
+    def run(dataset):
+        return list(filter(predicate, dataset.images))
+    return run
+
+
+def __reformat(result_format):
+    def run(dataset):
+        output = _NullOutput()
+        for piece in ifsrequest.__iter_reformat(
+                dataset.images, 'images', result_format):
+            output.write(piece)
+        return output.written
+    return run
+
+
+def __end_to_end(dataset):
+    """get_image_data against a local stand-in for the server"""
+    base_url = dataset.serve()
+    with patch.object(ifsrequest, '__get_base_url', lambda: base_url):
+        return ifsrequest.get_image_data(
+            'amazon',
+            'active',
+            'json',
+            command_arg_filter=FILTERS['~'],
+            out=_NullOutput()
+        )
+
+
+def get_benchmarks():
+    """Return the benchmark functions by name, each taking a Dataset"""
+    benchmarks = {
+        'parse': __parse,
+        'stream_parse': __stream_parse,
+        'reformat_json': __reformat('json'),
+        'reformat_xml': __reformat('xml'),
+        'get_image_data': __end_to_end
+    }
+    for operator, name in FILTER_NAMES.items():
+        benchmarks['filter_' + name] = __filter(operator)
+    return benchmarks
+
+
+def get_sizes():
+    """Return the dataset sizes to run, from PINT_BENCHMARK_SIZES"""
+    sizes = os.environ.get('PINT_BENCHMARK_SIZES')
+    if not sizes:
+        return DEFAULT_SIZES
+    return tuple(int(size) for size in sizes.split(','))
+
+
+def case_name(benchmark, size):
+    return '%s[%d]' % (benchmark, size)
+
+
+def calibrate(repeat=5):
+    """Time a fixed workload that stands for the speed of this machine"""
+    images = generate_images(2000, seed=1)
+    return best_of(
+        lambda: [json.loads(json.dumps(image)) for image in images], repeat
+    )
+
+
+def best_of(function, repeat):
+    timings = []
+    for run in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_suite(sizes=None, names=None, repeat=None, report=None):
+    """
+        Run the benchmarks on datasets of the given sizes and return the
+        best time of each case relative to the calibration loop. Large
+        datasets are run fewer times.
+    """
+    benchmarks = get_benchmarks()
+    results = {}
+    calibration = calibrate()
+    with patch.object(ifsrequest, '__cache', None):
+        for size in sizes or get_sizes():
+            dataset = Dataset(size)
+            runs = repeat or min(5, 100000 // size + 1)
+            try:
+                for name in sorted(names or benchmarks):
+                    seconds = best_of(
+                        lambda: benchmarks[name](dataset), runs
+                    )
+                    results[case_name(name, size)] = seconds / calibration
+                    if report:
+                        report(case_name(name, size), seconds)
+            finally:
+                dataset.close()
+    return results
+
+
+def load_baselines(path=BASELINE_PATH):
+    try:
+        with open(path, 'r') as baseline_file:
+            return json.load(baseline_file)['results']
+    except (IOError, ValueError, KeyError):
+        return {}
+
+
+def save_baselines(results, path=BASELINE_PATH):
+    """Merge results into the stored baselines"""
+    baselines = load_baselines(path)
+    baselines.update(results)
+    with open(path, 'w') as baseline_file:
+        json.dump(
+            {
+                'python': '%d.%d' % sys.version_info[:2],
+                'results': baselines
+            },
+            baseline_file,
+            indent=2,
+            sort_keys=True
+        )
+        baseline_file.write('\n')
+
+
+def compare(results, baselines, tolerance=DEFAULT_TOLERANCE):
+    """Return (case, ratio) for the cases slower than tolerance allows"""
+    regressions = []
+    for case, relative in sorted(results.items()):
+        baseline = baselines.get(case)
+        if baseline and relative / baseline > tolerance:
+            regressions.append((case, relative / baseline))
+    return regressions
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument(
+        '--save', action='store_true', help='store the results as baselines'
+    )
+    parser.add_argument(
+        '--tolerance', type=float, default=DEFAULT_TOLERANCE,
+        help='slowdown against the baseline reported as regression'
+    )
+    parser.add_argument('benchmarks', nargs='*', help='benchmarks to run')
+    options = parser.parse_args(args)
+    baselines = load_baselines()
+
+    def report(case, seconds):
+        print('%-32s %10.4fs' % (case, seconds))
+    results = run_suite(names=options.benchmarks or None, report=report)
+    if options.save:
+        save_baselines(results)
+        return 0
+    regressions = compare(results, baselines, options.tolerance)
+    for case, ratio in regressions:
+        print('regression: %s is %.1fx slower than its baseline' % (
+            case, ratio
+        ))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
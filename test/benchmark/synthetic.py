@@ -0,0 +1,62 @@
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+import random
+
+REGIONS = [
+    'us-east-1', 'us-east-2', 'us-west-1', 'us-west-2', 'eu-west-1',
+    'eu-central-1', 'ap-south-1', 'ap-northeast-1', 'sa-east-1'
+]
+STATES = ['active', 'inactive', 'deprecated', 'deleted']
+PRODUCTS = [
+    'sles-12-sp5', 'sles-15-sp4', 'sles-15-sp5', 'sles-sap-15-sp5',
+    'sles-15-sp5-byos', 'sles-15-sp5-chost-byos', 'suse-manager-4-3'
+]
+
+
+def __date(rng, year_from=2015, year_to=2025):
+    return '%04d%02d%02d' % (
+        rng.randint(year_from, year_to), rng.randint(1, 12), rng.randint(1, 28)
+    )
+
+
+def generate_images(count, seed=42):
+    """Return count image records shaped like the server's images.json"""
+    rng = random.Random(seed)
+    images = []
+    for index in range(count):
+        state = rng.choice(STATES)
+        published = __date(rng)
+        name = 'suse-%s-v%s-hvm-ssd-%s' % (
+            rng.choice(PRODUCTS), published, rng.choice(['x86_64', 'arm64'])
+        )
+        deprecated = __date(rng) if state in ('deprecated', 'deleted') else ''
+        images.append({
+            'deletedon': __date(rng) if state == 'deleted' else '',
+            'deprecatedon': deprecated,
+            'id': 'ami-%08x' % index,
+            'name': name,
+            'publishedon': published,
+            'region': rng.choice(REGIONS),
+            'replacementid': 'ami-%08x' % (index + 1) if deprecated else '',
+            'replacementname': name if deprecated else '',
+            'state': state
+        })
+    return images
@@ -0,0 +1,113 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+import lib.susepubliccloudinfoclient.columnar as columnar
+import lib.susepubliccloudinfoclient.infoserverrequests as ifsrequest
+import re
+import time
+from pytest import importorskip
+from unittest.mock import patch
+
+from .synthetic import generate_images
+
+FILTER_ARG = (
+    'name%suse-sles-15-sp[45].*,name!byos,name~x86_64,publishedon>20200101'
+)
+DATE_FILTER_ARG = 'publishedon>20200101,deprecatedon<20230101,name~x86_64'
+
+
+def chained_apply_filters(items, filters):
+    """The previous implementation: one full pass per filter"""
+    for a_filter in filters:
+        attr = a_filter['attr']
+        value = a_filter['value']
+        operator = a_filter['operator']
+        if operator == '%':
+            items = [
+                item for item in items
+                if re.match(value.lower(), item[attr].lower())
+            ]
+        elif operator == '!':
+            items = [
+                item for item in items
+                if value.lower() not in item[attr].lower()
+            ]
+        elif operator == '~':
+            items = [
+                item for item in items if value.lower() in item[attr].lower()
+            ]
+        elif operator == '>':
+            items = [item for item in items if int(item[attr]) > int(value)]
+    return items
+
+
+def compiled_apply_filters(items, filters):
+    """The single pass the queries use"""
+    return list(filter(ifsrequest.__compile_filters(filters), items))
+
+
+def best_of(function, *args, repeat=3):
+    timings = []
+    for run in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def test_compiled_filters_beat_chained_filters():
+    """Single pass evaluation on 100k synthetic images"""
+    images = generate_images(100000)
+    filters = ifsrequest.__parse_command_arg_filter(FILTER_ARG)
+    chained_time, chained = best_of(chained_apply_filters, images, filters)
+    compiled_time, compiled = best_of(
+        compiled_apply_filters, images, filters
+    )
+    print(
+        '\nfilter 100k images: chained %.3fs, compiled %.3fs, %.1fx' % (
+            chained_time, compiled_time, chained_time / compiled_time
+        )
+    )
+    assert compiled == chained
+    assert compiled_time < chained_time
+
+
+def test_vectorized_filters_beat_compiled_filters():
+    """Column masks against the compiled predicate on 100k images"""
+    importorskip('numpy')
+    images = generate_images(100000)
+    columns = columnar.ColumnSet(images)
+    for filter_arg in (FILTER_ARG, DATE_FILTER_ARG):
+        filters = ifsrequest.__parse_command_arg_filter(filter_arg)
+        compiled_time, compiled = best_of(
+            compiled_apply_filters, images, filters
+        )
+        vectorized_time, vectorized = best_of(columns.filter, filter_arg)
+        with patch.object(columnar, 'numpy', None):
+            scalar_time, scalar = best_of(columns.filter, filter_arg)
+        print(
+            '\nfilter 100k images by %s: compiled %.3fs, columns %.3fs, '
+            'vectorized %.3fs' % (
+                filter_arg, compiled_time, scalar_time, vectorized_time
+            )
+        )
+        assert list(vectorized) == list(scalar) == compiled
+        assert vectorized_time < compiled_time
@@ -0,0 +1,53 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+import lib.susepubliccloudinfoclient.infoserverrequests as ifsrequest
+import time
+
+from .synthetic import generate_images
+
+FORMATS = ('xml', 'json', 'plain', 'ndjson')
+
+
+def time_format(images, result_format, repeat=3):
+    timings = []
+    for run in range(repeat):
+        start = time.perf_counter()
+        for piece in ifsrequest.__iter_reformat(
+                images, 'images', result_format):
+            pass
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def test_plain_and_ndjson_beat_xml():
+    """Compare all output formats on 100k synthetic images"""
+    images = generate_images(100000)
+    timings = dict(
+        (result_format, time_format(images, result_format))
+        for result_format in FORMATS
+    )
+    print('\nformat 100k images: ' + ', '.join(
+        '%s %.3fs' % (result_format, timings[result_format])
+        for result_format in FORMATS
+    ))
+    assert timings['plain'] < timings['xml']
+    assert timings['ndjson'] < timings['xml']
@@ -0,0 +1,86 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)
+)))
+
+# Modules pint needs only to download or to write XML
+DEFERRED_MODULES = (
+    'requests', 'urllib3', 'lxml', 'lxml.etree', 'concurrent.futures.thread',
+    'susepubliccloudinfoclient.session'
+)
+
+# Microseconds for the imports of pint --version, it took about 150000
+# with requests and lxml imported up front
+COLD_START_LIMIT = 80000
+
+
+def import_times(tmp_path, *args):
+    """
+        Run pint with -X importtime and return the cumulative import time
+        of each module imported by the script itself
+    """
+    env = dict(
+        os.environ,
+        HOME=str(tmp_path),
+        PINT_NO_DAEMON='1',
+        PYTHONPATH=os.path.join(ROOT, 'lib')
+    )
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', os.path.join(ROOT, 'bin/pint')]
+        + list(args),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True
+    )
+    times = {}
+    top_level = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+        if not name.startswith('  '):
+            top_level[name.strip()] = int(cumulative)
+    return times, top_level
+
+
+def test_cold_start_imports(tmp_path):
+    """pint --version imports nothing it does not use, and does so fast"""
+    best = None
+    for attempt in range(3):
+        times, top_level = import_times(tmp_path, '--version')
+        assert not [name for name in DEFERRED_MODULES if name in times]
+        # site and what it pulls in are paid by every Python script
+        total = sum(
+            cumulative for name, cumulative in top_level.items()
+            if name != 'site'
+        )
+        best = total if best is None else min(best, total)
+    print('\nimports of pint --version: %.1f ms' % (best / 1000.0))
+    assert best < COLD_START_LIMIT
@@ -0,0 +1,52 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+
+import gc
+import tracemalloc
+
+from lib.susepubliccloudinfoclient.columnar import ColumnSet
+
+from .synthetic import generate_images
+
+
+def measure(build):
+    """Return the result of build and the memory it holds on to"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+def test_columns_use_less_memory_than_dicts():
+    """Compare list of dicts and ColumnSet on 100k synthetic images"""
+    images, dict_size = measure(lambda: generate_images(100000))
+    columns, column_size = measure(lambda: ColumnSet(generate_images(100000)))
+    print('\nmemory for 100k images: dicts %.1f MiB, columns %.1f MiB' % (
+        dict_size / 2.0 ** 20, column_size / 2.0 ** 20
+    ))
+    assert len(columns) == len(images)
+    assert column_size < dict_size / 2
@@ -0,0 +1,55 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+import os
+from pytest import fixture, mark, skip
+
+from . import suite
+
+CASES = [
+    (name, size)
+    for size in suite.get_sizes()
+    for name in sorted(suite.get_benchmarks())
+]
+TOLERANCE = float(
+    os.environ.get('PINT_BENCHMARK_TOLERANCE', suite.DEFAULT_TOLERANCE)
+)
+
+
+@fixture(scope='module')
+def results():
+    return suite.run_suite()
+
+
+@fixture(scope='module')
+def baselines():
+    return suite.load_baselines()
+
+
+@mark.parametrize('name,size', CASES)
+def test_no_regression(name, size, results, baselines):
+    """Each benchmark stays within TOLERANCE of its stored baseline"""
+    case = suite.case_name(name, size)
+    if case not in baselines:
+        skip('no baseline for %s' % case)
+    ratio = results[case] / baselines[case]
+    print('\n%s: %.2fx the baseline' % (case, ratio))
+    assert ratio < TOLERANCE
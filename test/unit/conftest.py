@@ -0,0 +1,118 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+
+import collections
+import lib.susepubliccloudinfoclient.infoserverrequests as ifsrequest
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pytest import fixture
+from unittest.mock import patch
+
+Request = collections.namedtuple(
+    'Request', ['path', 'headers', 'client_address']
+)
+
+
+class StandInServer(object):
+    """
+        Local stand-in for the information server. Every request is
+        answered by respond(request), which returns the status, a dict of
+        headers and the body, bytes or an iterable of bytes written as it
+        is produced. The requests are recorded, and the number of requests
+        respond handles at the same time is tracked. With keep_alive the
+        server speaks HTTP/1.1 and keeps connections open.
+    """
+
+    def __init__(self, respond, keep_alive=False):
+        self.respond = respond
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self.aborted = threading.Event()
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(
+            ('127.0.0.1', 0), _handler(self, keep_alive)
+        )
+        self.url = 'http://127.0.0.1:%d' % self.httpd.server_address[1]
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def answer(self, request):
+        with self.lock:
+            self.requests.append(request)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            return self.respond(request)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _handler(server, keep_alive):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1' if keep_alive else 'HTTP/1.0'
+
+        def do_GET(self):
+            status, headers, body = server.answer(
+                Request(self.path, dict(self.headers), self.client_address)
+            )
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            if isinstance(body, bytes):
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            self.end_headers()
+            try:
+                for chunk in body:
+                    self.wfile.write(chunk)
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                server.aborted.set()
+
+        def log_message(self, *args):
+            pass
+    return Handler
+
+
+@fixture
+def stand_in():
+    """
+        Start a StandInServer with stand_in(respond, keep_alive=False);
+        queries go to the server started last
+    """
+    servers = []
+
+    def start(respond, keep_alive=False):
+        servers.append(StandInServer(respond, keep_alive))
+        return servers[-1]
+    with patch.object(ifsrequest, '__get_base_url', lambda: servers[-1].url):
+        yield start
+    for server in servers:
+        server.close()
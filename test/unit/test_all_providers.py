@@ -0,0 +1,136 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+import lib.susepubliccloudinfoclient.asyncinfoserverrequests as \
+    aifsrequest
+import lib.susepubliccloudinfoclient.infoserverrequests as ifsrequest
+import asyncio
+import json
+import threading
+import time
+from pytest import fixture, raises
+from unittest.mock import patch
+
+PROVIDERS = ['amazon', 'broken', 'google', 'microsoft']
+
+
+class FakeDocuments(object):
+    """
+        Documents of the stand-in providers, 'amazon' answers slowly and
+        'broken' not at all
+    """
+
+    def __init__(self, providers):
+        self.providers = providers
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, url, info_type):
+        path = url.split('/v1/')[1]
+        if path == 'providers.json':
+            return iter([{'name': name} for name in self.providers])
+        provider = path.split('/')[0]
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.3 if provider == 'amazon' else 0.1)
+        with self.lock:
+            self.active -= 1
+        if provider == 'broken':
+            raise LookupError('The server responded with an error.')
+        return iter([
+            {'id': '%s-%d' % (provider, number), 'name': 'sles-%d' % number}
+            for number in range(2)
+        ])
+
+
+@fixture
+def documents():
+    fake = FakeDocuments(PROVIDERS)
+    with patch(
+        'lib.susepubliccloudinfoclient.infoserverrequests.'
+        '__iter_document_items',
+        side_effect=fake
+    ):
+        yield fake
+
+
+@patch('lib.susepubliccloudinfoclient.infoserverrequests.__warn')
+def test_all_providers_tagged_in_order(mock_warn, documents):
+    result = json.loads(ifsrequest.get_image_data(
+        ifsrequest.ALL_PROVIDERS, 'active', 'json',
+        command_arg_filter='name~sles-1'
+    ))
+    assert [
+        (image['provider'], image['id']) for image in result['images']
+    ] == [
+        ('amazon', 'amazon-1'), ('google', 'google-1'),
+        ('microsoft', 'microsoft-1')
+    ]
+    assert documents.max_active == len(PROVIDERS)
+    mock_warn.assert_called_once()
+    assert 'broken' in mock_warn.call_args[0][0]
+
+
+@patch('lib.susepubliccloudinfoclient.infoserverrequests.__warn')
+def test_all_providers_bounded(mock_warn, documents):
+    ifsrequest.configure_concurrency(2)
+    try:
+        ifsrequest.get_image_data(ifsrequest.ALL_PROVIDERS, 'active')
+    finally:
+        ifsrequest.configure_concurrency()
+    assert documents.max_active == 2
+
+
+@patch('lib.susepubliccloudinfoclient.infoserverrequests.__warn')
+def test_all_providers_records(mock_warn, documents):
+    servers = ifsrequest.get_servers(ifsrequest.ALL_PROVIDERS, 'smt')
+    assert [server.provider for server in servers] == [
+        'amazon', 'amazon', 'google', 'google', 'microsoft', 'microsoft'
+    ]
+
+
+@patch('lib.susepubliccloudinfoclient.infoserverrequests.__warn')
+@patch('lib.susepubliccloudinfoclient.infoserverrequests.__error')
+def test_all_providers_failing(mock_error, mock_warn, documents):
+    documents.providers = ['broken']
+    mock_error.side_effect = LookupError('failed')
+    with raises(LookupError):
+        ifsrequest.get_image_data(ifsrequest.ALL_PROVIDERS, 'active')
+    mock_error.assert_called_once_with(
+        'Unable to retrieve data for any of the providers.'
+    )
+
+
+@patch('lib.susepubliccloudinfoclient.infoserverrequests.__warn')
+def test_all_providers_async(mock_warn, documents):
+    result = json.loads(asyncio.run(aifsrequest.get_image_data(
+        ifsrequest.ALL_PROVIDERS, 'active', 'json',
+        command_arg_filter='name~sles-1'
+    )))
+    assert [image['provider'] for image in result['images']] == [
+        'amazon', 'google', 'microsoft'
+    ]
+    regions = asyncio.run(aifsrequest.get_regions_data(
+        ifsrequest.ALL_PROVIDERS, None, 'json'
+    ))
+    assert json.loads(regions)['regions'][0]['provider'] == 'amazon'
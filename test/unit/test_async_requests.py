@@ -0,0 +1,122 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+
+import lib.susepubliccloudinfoclient.asyncinfoserverrequests as \
+    aifsrequest
+import lib.susepubliccloudinfoclient.infoserverrequests as ifsrequest
+import asyncio
+import json
+import time
+from pytest import fixture, raises
+from unittest.mock import patch
+
+ITEM_PADDING = 'x' * 70000
+
+
+def respond(request):
+    """
+        Serve one item per region after a short delay, 'broken-1' does
+        not exist and 'slow-1' trickles out large items for a long time
+    """
+    region, info_type = request.path.split('/')[3:5]
+    info_type = info_type.replace('.json', '')
+    if region == 'slow-1':
+        return 200, {}, trickle(info_type)
+    time.sleep(0.1)
+    if region == 'broken-1':
+        return 404, {}, b''
+    return 200, {}, json.dumps(
+        {info_type: [{'id': 'id-%s' % region, 'region': region}]}
+    ).encode()
+
+
+def trickle(info_type):
+    yield ('{"%s": [' % info_type).encode()
+    for index in range(200):
+        item = json.dumps({'id': index, 'padding': ITEM_PADDING})
+        yield ((',' if index else '') + item).encode()
+        time.sleep(0.05)
+    yield b']}'
+
+
+@fixture
+def server(stand_in):
+    yield stand_in(respond)
+    aifsrequest.configure_concurrency()
+
+
+def test_same_result_as_blocking_api(server):
+    region = 'us-east-1,eu-west-1,ap-south-1'
+    for result_format in ('json', 'xml', 'plain'):
+        assert asyncio.run(aifsrequest.get_image_data(
+            'amazon', 'active', result_format, region, 'id~east'
+        )) == ifsrequest.get_image_data(
+            'amazon', 'active', result_format, region, 'id~east'
+        )
+    assert asyncio.run(aifsrequest.get_server_data(
+        'amazon', 'smt', 'ndjson', 'eu-west-1'
+    )) == ifsrequest.get_server_data('amazon', 'smt', 'ndjson', 'eu-west-1')
+
+
+def test_concurrent_lookups_are_bounded(server):
+    aifsrequest.configure_concurrency(max_requests=3)
+
+    async def lookups():
+        return await asyncio.gather(*[
+            aifsrequest.get_server_data('amazon', None, 'json', 'r-%d' % i)
+            for i in range(12)
+        ])
+    results = asyncio.run(lookups())
+    assert [
+        json.loads(result)['servers'][0]['region'] for result in results
+    ] == ['r-%d' % i for i in range(12)]
+    assert 1 < server.max_active <= 3
+
+
+def test_cancellation_stops_the_download(server):
+    async def cancelled_lookup():
+        task = asyncio.ensure_future(
+            aifsrequest.get_image_data('amazon', 'active', 'json', 'slow-1')
+        )
+        await asyncio.sleep(0.3)
+        task.cancel()
+        with raises(asyncio.CancelledError):
+            await task
+    asyncio.run(cancelled_lookup())
+    # the whole document would take ten seconds
+    assert server.aborted.wait(3)
+
+
+@patch('lib.susepubliccloudinfoclient.infoserverrequests.__warn')
+def test_failing_region_is_skipped(mock_warn, server):
+    result = json.loads(asyncio.run(aifsrequest.get_image_data(
+        'amazon', 'active', 'json', 'eu-west-1,broken-1'
+    )))
+    assert [image['region'] for image in result['images']] == ['eu-west-1']
+    assert 'broken-1' in mock_warn.call_args[0][0]
+
+
+def test_failure_is_an_error(server, capsys):
+    with raises(LookupError):
+        asyncio.run(
+            aifsrequest.get_image_data('amazon', 'active', 'json', 'broken-1')
+        )
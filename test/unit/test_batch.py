@@ -0,0 +1,128 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+
+import lib.susepubliccloudinfoclient.batch as batch
+import json
+from io import StringIO
+from pytest import fixture
+from unittest.mock import patch
+
+
+def load_fixture(name, info_type):
+    with open('../data/%s' % name, 'r') as fixture:
+        return json.load(fixture)[info_type]
+
+
+def fake_documents(url, info_type):
+    if 'broken' in url:
+        raise LookupError('The server responded with an error.')
+    if info_type == 'providers':
+        return iter([{'name': 'amazon'}, {'name': 'broken'}])
+    if info_type == 'images':
+        return iter(
+            load_fixture('v1_amazon_us-west-1_images_active.json', 'images')
+        )
+    return iter(load_fixture('v1_amazon_us-east-1_servers.json', 'servers'))
+
+
+@fixture
+def documents():
+    with patch(
+        'lib.susepubliccloudinfoclient.infoserverrequests.'
+        '__iter_document_items',
+        side_effect=fake_documents
+    ) as mock_documents:
+        yield mock_documents
+
+
+def fetched_paths(mock_documents):
+    return sorted(
+        call[0][0].split('/v1/')[1] for call in mock_documents.call_args_list
+    )
+
+
+def test_queries_share_documents(documents):
+    queries = batch.read_queries([
+        '# same document, different filters',
+        '{"type": "images", "provider": "amazon", "state": "active",'
+        ' "region": "us-west-1", "filter": "name~byos"}',
+        '',
+        '{"type": "images", "provider": "amazon", "state": "active",'
+        ' "region": "us-west-1", "filter": "publishedon>20150101"}',
+        '{"type": "servers", "provider": "amazon", "server_type": "smt",'
+        ' "region": "us-east-1,us-west-1"}',
+        '{"type": "servers", "provider": "amazon", "server_type": "smt",'
+        ' "region": "us-west-1"}'
+    ])
+    results = list(batch.run_batch(queries))
+    assert fetched_paths(documents) == [
+        'amazon/us-east-1/servers/smt.json',
+        'amazon/us-west-1/images/active.json',
+        'amazon/us-west-1/servers/smt.json'
+    ]
+    assert [len(result['images']) for result in results[:2]] == [5, 9]
+    assert results[0]['query']['filter'] == 'name~byos'
+    assert [len(result['servers']) for result in results[2:]] == [6, 3]
+
+
+def test_bad_queries_are_answered_with_errors(documents):
+    queries = batch.read_queries([
+        'not json',
+        '{"type": "volumes", "provider": "amazon"}',
+        '{"type": "images"}',
+        '{"type": "images", "provider": "amazon", "filter": "size>1"}',
+        '{"type": "images", "provider": "amazon", "region": "broken-1"}',
+        '{"type": "providers"}'
+    ])
+    out = StringIO()
+    batch.write_results(batch.run_batch(queries), out)
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert results[0] == {'query': 'not json', 'error': 'Not a JSON object.'}
+    assert results[1]['error'].startswith('Unknown type "volumes"')
+    assert results[2]['error'] == 'No provider given.'
+    assert results[3]['error'] == "Invalid filter phrase 'size>1'."
+    assert 'The server responded with an error.' in results[4]['error']
+    assert 'providers' in results[5]
+    assert fetched_paths(documents) == [
+        'amazon/broken-1/images.json', 'providers.json'
+    ]
+
+
+@patch('lib.susepubliccloudinfoclient.infoserverrequests.__warn')
+def test_all_providers(mock_warn, documents):
+    queries = batch.read_queries([
+        '{"type": "images", "provider": "all", "state": "active",'
+        ' "filter": "name~byos"}',
+        '{"type": "images", "provider": "all", "state": "active"}'
+    ])
+    results = list(batch.run_batch(queries))
+    assert fetched_paths(documents) == [
+        'amazon/images/active.json',
+        'broken/images/active.json',
+        'providers.json'
+    ]
+    assert [len(result['images']) for result in results] == [5, 13]
+    assert set(image['provider'] for image in results[1]['images']) == set(
+        ['amazon']
+    )
+    # the failing provider is skipped, once for every query
+    assert mock_warn.call_count == 2
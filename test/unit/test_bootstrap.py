@@ -0,0 +1,99 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+import lib.susepubliccloudinfoclient.bootstrap as bootstrap
+import lib.susepubliccloudinfoclient.infoserverrequests as ifsrequest
+import requests
+import time
+from io import StringIO
+from lib.susepubliccloudinfoclient.records import ImageState, Provider
+from unittest.mock import patch
+
+PROVIDERS = [Provider({'name': 'amazon'}), Provider({'name': 'alibaba'})]
+STATES = [ImageState({'name': 'active'}), ImageState({'name': 'deleted'})]
+
+
+def test_bundled_snapshot_without_file(tmp_path):
+    """Without a stored snapshot the bundled lists are used"""
+    snapshot = bootstrap.load_snapshot(str(tmp_path / 'missing.json'))
+    assert snapshot['providers'] == bootstrap.BUNDLED_PROVIDERS
+    assert snapshot['states'] == bootstrap.BUNDLED_IMAGE_STATES
+    assert bootstrap.needs_refresh(snapshot)
+
+
+def test_corrupt_snapshot_falls_back_to_bundled(tmp_path):
+    path = tmp_path / 'bootstrap.json'
+    path.write_text('{"providers": ')
+    snapshot = bootstrap.load_snapshot(str(path))
+    assert snapshot['providers'] == bootstrap.BUNDLED_PROVIDERS
+
+
+@patch('lib.susepubliccloudinfoclient.infoserverrequests.get_image_states')
+@patch('lib.susepubliccloudinfoclient.infoserverrequests.get_providers')
+def test_refresh_stores_server_data(mock_providers, mock_states, tmp_path):
+    mock_providers.return_value = PROVIDERS
+    mock_states.return_value = STATES
+    path = str(tmp_path / 'bootstrap.json')
+    bootstrap.refresh_snapshot(path)
+    snapshot = bootstrap.load_snapshot(path)
+    assert snapshot['providers'] == ['amazon', 'alibaba']
+    assert snapshot['states'] == ['active', 'deleted']
+    assert not bootstrap.needs_refresh(snapshot)
+
+
+@patch('lib.susepubliccloudinfoclient.bootstrap.fetch_snapshot')
+def test_failed_background_refresh_is_not_retried(mock_fetch, tmp_path):
+    """An unsuccessful attempt still counts against the refresh interval"""
+    mock_fetch.side_effect = LookupError('offline')
+    path = str(tmp_path / 'bootstrap.json')
+    snapshot = bootstrap.load_snapshot(path)
+    bootstrap.refresh_in_background(snapshot, path).join()
+    snapshot = bootstrap.load_snapshot(path)
+    assert snapshot['stored'] == 0
+    assert not bootstrap.needs_refresh(snapshot)
+
+
+@patch('lib.susepubliccloudinfoclient.infoserverrequests.__get_session')
+def test_background_refresh_is_quiet(mock_session, tmp_path):
+    """An unreachable server is not reported to the user"""
+    mock_session.return_value.get.side_effect = (
+        requests.exceptions.ConnectionError('down')
+    )
+    error = ifsrequest.__error
+    out = StringIO()
+    path = str(tmp_path / 'bootstrap.json')
+    snapshot = bootstrap.load_snapshot(path)
+    with patch(
+        'lib.susepubliccloudinfoclient.infoserverrequests.__error',
+        side_effect=lambda message: error(message, out)
+    ) as mock_error:
+        bootstrap.refresh_in_background(snapshot, path).join()
+    assert mock_error.called
+    assert out.getvalue() == ''
+
+
+def test_old_snapshot_needs_refresh():
+    snapshot = {
+        'providers': ['amazon'],
+        'states': ['active'],
+        'stored': time.time() - bootstrap.REFRESH_INTERVAL - 1
+    }
+    assert bootstrap.needs_refresh(snapshot)
@@ -0,0 +1,180 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+
+import lib.susepubliccloudinfoclient.infoserverrequests as ifsrequest
+import json
+import threading
+import time
+from io import StringIO
+from pytest import fixture
+from unittest.mock import patch
+
+with open('../data/v1_amazon_us-west-1_images_active.json', 'rb') as data:
+    BODY = data.read()
+
+CALLERS = 8
+
+
+def respond(request):
+    """Serve BODY after a while, or nothing for unknown regions"""
+    time.sleep(0.3)
+    if 'us-west-1' not in request.path:
+        return 404, {}, b''
+    return 200, {'Content-Type': 'application/json'}, BODY
+
+
+@fixture
+def server(stand_in):
+    return stand_in(respond).requests
+
+
+def call_at_once(function, callers=CALLERS):
+    """Call function from several threads at the same moment"""
+    barrier = threading.Barrier(callers)
+    results = [None] * callers
+
+    def call(number):
+        barrier.wait()
+        try:
+            results[number] = function()
+        except Exception as e:
+            results[number] = e
+    threads = [
+        threading.Thread(target=call, args=(number,))
+        for number in range(callers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_simultaneous_callers_share_one_request(server):
+    events = []
+    ifsrequest.add_timing_hook(events.append)
+    try:
+        results = call_at_once(lambda: ifsrequest.get_image_data(
+            'amazon', 'active', 'json', 'us-west-1', 'name~byos'
+        ))
+    finally:
+        ifsrequest.remove_timing_hook(events.append)
+    assert len(server) == 1
+    assert len(set(results)) == 1
+    assert len(json.loads(results[0])['images']) == 5
+    shared = [
+        event for event in events
+        if event['stage'] == 'cache' and event['result'] == 'shared'
+    ]
+    assert len(shared) == CALLERS - 1
+
+
+def test_simultaneous_callers_share_records(server):
+    results = call_at_once(
+        lambda: ifsrequest.get_images('amazon', 'active', 'us-west-1')
+    )
+    assert len(server) == 1
+    assert [len(images) for images in results] == [13] * CALLERS
+    assert len(set(
+        tuple(image.id for image in images) for images in results
+    )) == 1
+
+
+@patch('lib.susepubliccloudinfoclient.infoserverrequests.__error')
+def test_simultaneous_callers_share_the_error(mock_error, server):
+    mock_error.side_effect = LookupError('failed')
+    results = call_at_once(lambda: ifsrequest.get_image_data(
+        'amazon', 'active', 'json', 'eu-west-9'
+    ))
+    assert len(server) == 1
+    assert all(isinstance(result, LookupError) for result in results)
+    mock_error.assert_called_once()
+
+
+def test_consecutive_callers_fetch_anew(server):
+    out = StringIO()
+    ifsrequest.get_image_data('amazon', 'active', 'json', 'us-west-1', out=out)
+    ifsrequest.get_image_data('amazon', 'active', 'json', 'us-west-1', out=out)
+    assert len(server) == 2
+
+
+def test_interleaved_fetches_in_one_thread(server):
+    url = ifsrequest.__form_url(
+        'amazon', 'images', 'json', 'us-west-1', 'active'
+    )
+    first = ifsrequest.__share_document_items(url, 'images')
+    second = ifsrequest.__share_document_items(url, 'images')
+    assert len(list(second)) == len(list(first)) == 13
+    assert len(server) == 2
+
+
+def trickle(request):
+    """Serve a document of 20 images an image at a time"""
+    def body():
+        yield b'{"images": ['
+        for number in range(20):
+            image = json.dumps({'id': 'ami-%d' % number})
+            yield ((',' if number else '') + image).encode()
+            time.sleep(0.02)
+        yield b']}'
+    return 200, {'Content-Type': 'application/json'}, body()
+
+
+def join_while_streaming(url):
+    """Ask for url from another thread and return the thread and items"""
+    joined = []
+    thread = threading.Thread(target=lambda: joined.append(
+        list(ifsrequest.__share_document_items(url, 'images'))
+    ))
+    thread.start()
+    return thread, joined
+
+
+def test_late_callers_share_the_download(stand_in):
+    server = stand_in(trickle)
+    url = ifsrequest.__form_url('amazon', 'images', 'json', region='us-west-1')
+    items = ifsrequest.__share_document_items(url, 'images')
+    first = next(items)
+    thread, joined = join_while_streaming(url)
+    while ifsrequest.__flights[url].followers == 0:
+        time.sleep(0.01)
+    rest = list(items)
+    thread.join()
+    assert len(server.requests) == 1
+    assert joined == [[first] + rest]
+    assert len(rest) == 19
+
+
+@patch('lib.susepubliccloudinfoclient.infoserverrequests.__flight_window', 2)
+def test_callers_after_the_window_fetch_anew(stand_in):
+    server = stand_in(trickle)
+    url = ifsrequest.__form_url('amazon', 'images', 'json', region='us-west-1')
+    items = ifsrequest.__share_document_items(url, 'images')
+    next(items)
+    next(items)
+    # a thread streaming on its own keeps no more than the window
+    assert url not in ifsrequest.__flights
+    thread, joined = join_while_streaming(url)
+    list(items)
+    thread.join()
+    assert len(server.requests) == 2
+    assert len(joined[0]) == 20
@@ -0,0 +1,111 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+
+import lib.susepubliccloudinfoclient.columnar as columnar
+import lib.susepubliccloudinfoclient.infoserverrequests as ifsrequest
+import json
+from io import StringIO
+from lib.susepubliccloudinfoclient.columnar import ColumnSet
+from pytest import fixture, importorskip
+from unittest.mock import patch
+
+
+@fixture(params=['vectorized', 'scalar'])
+def filter_path(request):
+    """Run a test with NumPy, if it is installed, and without"""
+    if request.param == 'vectorized':
+        importorskip('numpy')
+        yield request.param
+    else:
+        with patch.object(columnar, 'numpy', None):
+            yield request.param
+
+
+def fixture_images():
+    fixture_file = '../data/v1_amazon_us-west-1_images_active.json'
+    with open(fixture_file, 'r') as fixture:
+        return json.load(fixture)['images']
+
+
+def test_items_round_trip():
+    images = fixture_images()
+    columns = ColumnSet(images)
+    assert len(columns) == 13
+    assert list(columns) == images
+    assert [list(item) for item in columns] == [list(item) for item in images]
+    assert columns.column('id')[:2] == ['ami-b97c8ffd', 'ami-2f63906b']
+
+
+def test_missing_keys_and_odd_dates():
+    items = [
+        {'name': 'a', 'publishedon': '20150714'},
+        {'name': 'b', 'urn': 'SUSE:sles:15', 'publishedon': ''},
+        {'name': 'c', 'publishedon': 'unknown'}
+    ]
+    assert list(ColumnSet(items)) == items
+
+
+def test_filters_match_scalar_filters(filter_path):
+    images = fixture_images() + [
+        {'name': 'SLES-15-SP7-BYOS', 'urn': 'SUSE:sles-byos:15-sp7'}
+    ]
+    columns = ColumnSet(images)
+    for command_arg_filter in (
+            'id=ami-b97c8ffd',
+            'name~11-SP4',
+            'name!byos',
+            'name%suse-sles-12-v[0-9]*-hvm-.*',
+            'publishedon>20141023',
+            'publishedon<20150127',
+            'publishedon=20150714',
+            'deprecatedon<20200101',
+            'name~sles,name!byos,publishedon>20141023',
+            'publishedon>99999999999',
+            'publishedon<99999999999'):
+        filters = ifsrequest.__parse_command_arg_filter(command_arg_filter)
+        assert list(columns.filter(command_arg_filter)) == \
+            list(filter(ifsrequest.__compile_filters(filters), images[:-1])), \
+            command_arg_filter
+
+
+def test_filters_narrow_a_selection(filter_path):
+    columns = ColumnSet(fixture_images()).filter('name~byos')
+    assert len(columns) == 5
+    assert len(columns.filter('name~nothing').filter('name~byos')) == 0
+    assert columns.filter('publishedon<20150101').column('id') == [
+        'ami-99796ddc', 'ami-557a6e10'
+    ]
+
+
+def test_format_matches_data_functions():
+    images = fixture_images()
+    with patch(
+        'lib.susepubliccloudinfoclient.infoserverrequests.'
+        '__iter_document_items',
+        return_value=iter(images)
+    ):
+        columns = ifsrequest.get_image_columns('amazon', 'active')
+    for result_format in ('json', 'ndjson', 'plain', 'xml'):
+        assert columns.format(result_format) == \
+            ifsrequest.__reformat(images, 'images', result_format)
+    out = StringIO()
+    assert columns.filter('name~byos').format('json', out) == 5
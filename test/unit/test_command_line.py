@@ -0,0 +1,146 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+
+import json
+import lib.susepubliccloudinfoclient.infoserverrequests as ifsrequest
+import os
+import subprocess
+import sys
+from lib.susepubliccloudinfoclient.responsecache import ResponseCache
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)
+)))
+
+
+def pint(tmp_path, *args, **kwargs):
+    """
+        Run bin/pint without a daemon or network access, kwargs override
+        the arguments to subprocess.run
+    """
+    env = dict(
+        os.environ,
+        HOME=str(tmp_path),
+        XDG_CACHE_HOME=str(tmp_path),
+        PINT_NO_DAEMON='1',
+        PYTHONPATH=os.path.join(ROOT, 'lib')
+    )
+    options = dict(
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        timeout=60
+    )
+    options.update(kwargs)
+    return subprocess.run(
+        [sys.executable, os.path.join(ROOT, 'bin/pint')] + list(args),
+        **options
+    )
+
+
+def test_missing_ids_file_is_reported(tmp_path):
+    result = pint(
+        tmp_path, 'amazon', 'images', '--offline',
+        '--ids-from=%s' % (tmp_path / 'ids.txt')
+    )
+    assert result.returncode == 1
+    assert result.stderr.startswith('Error: ')
+    assert 'ids.txt' in result.stderr
+
+
+def test_missing_batch_file_is_reported(tmp_path):
+    result = pint(
+        tmp_path, 'batch', str(tmp_path / 'queries.ndjson'), '--offline'
+    )
+    assert result.returncode == 1
+    assert result.stderr.startswith('Error: ')
+    assert 'queries.ndjson' in result.stderr
+
+
+def test_closed_output_is_not_an_error(tmp_path):
+    """pint ... | head stops reading early, that is fine"""
+    cache = ResponseCache(directory=str(tmp_path / 'pint' / 'responses'))
+    with open('../data/v1_amazon_us-west-1_images_active.json', 'rb') as data:
+        cache.store(
+            ifsrequest.__form_url('amazon', 'images', 'json'), data.read()
+        )
+    read, write = os.pipe()
+    os.close(read)
+    try:
+        result = pint(
+            tmp_path, 'amazon', 'images', '--offline', '--ndjson',
+            stdout=write
+        )
+    finally:
+        os.close(write)
+    assert result.returncode == 0
+    assert result.stderr == ''
+
+
+def test_snapshot_failure_is_reported(tmp_path):
+    # a directory where the snapshot database belongs
+    (tmp_path / 'pint' / 'snapshot.db').mkdir(parents=True)
+    # a recent bootstrap snapshot, nothing is refreshed in the background
+    (tmp_path / 'pint' / 'bootstrap.json').write_text(json.dumps({
+        'providers': ['amazon'], 'states': ['active'], 'stored': time.time()
+    }))
+    result = pint(tmp_path, 'sync', '--incremental')
+    assert result.returncode == 1
+    assert result.stderr.startswith('Error: Unable to update the snapshot')
+    result = pint(tmp_path, 'amazon', 'images', '--snapshot')
+    assert result.returncode == 1
+    assert result.stderr.startswith('Error: Unable to read the snapshot')
+
+
+BACKGROUND = '''
+import sys
+import time
+sys.path.insert(0, %r)
+import susepubliccloudinfoclient.infoserverrequests as ifsrequest
+
+
+def finish(path, seconds):
+    time.sleep(seconds)
+    open(path, 'w').close()
+
+ifsrequest.run_in_background('pint-refresh', finish, sys.argv[1], 0.1)
+ifsrequest.run_in_background('pint-refresh', finish, sys.argv[2], 30)
+'''
+
+
+def test_exit_does_not_wait_for_slow_background_work(tmp_path):
+    quick = tmp_path / 'quick'
+    slow = tmp_path / 'slow'
+    started = time.time()
+    subprocess.run(
+        [
+            sys.executable, '-c', BACKGROUND % os.path.join(ROOT, 'lib'),
+            str(quick), str(slow)
+        ],
+        timeout=60
+    )
+    assert time.time() - started < 10
+    # work that finishes in a moment still gets done
+    assert quick.exists()
+    assert not slow.exists()
@@ -0,0 +1,243 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+
+import lib.susepubliccloudinfoclient.daemon as daemon
+import lib.susepubliccloudinfoclient.infoserverrequests as ifsrequest
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from io import StringIO
+from pytest import fixture
+from unittest.mock import patch
+
+SCRIPT = '''
+import os
+import sys
+import threading
+if sys.argv[1:2] == ['cwd']:
+    sys.stdout.write(os.getcwd())
+    sys.exit(0)
+sys.stdout.write('argv %s\\n' % ' '.join(sys.argv[1:]))
+sys.stderr.write('warned\\n')
+sys.exit(int(sys.argv[-1]))
+'''
+
+SERVE = '''
+import sys
+import threading
+sys.path.insert(0, %r)
+import lib.susepubliccloudinfoclient.daemon as daemon
+daemon.serve(sys.argv[1], sys.argv[2])
+'''
+
+
+@fixture
+def socket_path(tmp_path):
+    script = tmp_path / 'pint'
+    script.write_text(SCRIPT)
+    path = str(tmp_path / 'pint.sock')
+    root = os.path.abspath(os.path.join(os.getcwd(), '..', '..'))
+    process = subprocess.Popen(
+        [sys.executable, '-c', SERVE % root, str(script), path]
+    )
+    for attempt in range(100):
+        if os.path.exists(path):
+            break
+        time.sleep(0.05)
+    yield path
+    process.terminate()
+    process.wait()
+
+
+@fixture
+def documents(tmp_path):
+    ifsrequest.configure_cache(directory=str(tmp_path))
+    ifsrequest.configure_documents(daemon.DocumentStore())
+    yield
+    ifsrequest.configure_documents()
+    ifsrequest.configure_cache(enabled=False)
+
+
+def test_forward_copies_output_and_status(socket_path):
+    out = StringIO()
+    err = StringIO()
+    assert daemon.forward(['images', '3'], socket_path, out, err) == 3
+    assert out.getvalue() == 'argv images 3\n'
+    assert err.getvalue() == 'warned\n'
+    assert daemon.forward(['servers', '0'], socket_path, out, err) == 0
+    assert out.getvalue().endswith('argv servers 0\n')
+
+
+def test_forward_runs_in_our_directory(socket_path, tmp_path, monkeypatch):
+    work = tmp_path / 'work'
+    work.mkdir()
+    monkeypatch.chdir(work)
+    out = StringIO()
+    assert daemon.forward(['cwd'], socket_path, out, StringIO()) == 0
+    assert out.getvalue() == str(work)
+
+
+def test_missing_directory_is_reported(tmp_path):
+    stdout = daemon._Output('out', StringIO())
+    stderr = daemon._Output('err', StringIO())
+    messages = []
+    cwd = os.getcwd()
+    status = daemon.__run_script(
+        compile('', 'pint', 'exec'), 'pint', [], str(tmp_path / 'gone'),
+        messages.append, stdout, stderr
+    )
+    assert status == 1
+    assert 'No such file or directory' in messages[0]['err']
+    assert os.getcwd() == cwd
+
+
+def test_output_of_worker_threads_is_sent():
+    """What threads of a command line write goes to its client"""
+    fallback = StringIO()
+    stdout = daemon._Output('out', fallback)
+    stderr = daemon._Output('err', fallback)
+    messages = []
+    code = compile(
+        'import sys\n'
+        'import threading\n'
+        'for name in ("worker", "pint-refresh"):\n'
+        '    thread = threading.Thread(\n'
+        '        target=sys.stderr.write, args=(name,), name=name\n'
+        '    )\n'
+        '    thread.start()\n'
+        '    thread.join()\n',
+        'pint',
+        'exec'
+    )
+    with patch.object(sys, 'stderr', stderr):
+        status = daemon.__run_script(
+            code, 'pint', [], None, messages.append, stdout, stderr
+        )
+    assert status == 0
+    assert messages == [{'err': 'worker'}]
+    assert fallback.getvalue() == 'pint-refresh'
+
+
+def test_forward_without_daemon(tmp_path):
+    assert daemon.forward(['providers'], str(tmp_path / 'none.sock')) is None
+
+
+def test_can_forward():
+    assert daemon.can_forward(['images', 'amazon', '--json'])
+    assert daemon.can_forward(['batch', 'queries.ndjson'])
+    assert not daemon.can_forward(['serve'])
+    assert not daemon.can_forward(['batch'])
+    assert not daemon.can_forward(['batch', '-'])
+    assert not daemon.can_forward(['amazon', 'images', '--ids-from=-'])
+    with patch.dict(os.environ, {'PINT_NO_DAEMON': '1'}):
+        assert not daemon.can_forward(['providers'])
+
+
+def test_documents_parsed_once(documents):
+    with open('../data/v1_amazon_us-west-1_images_active.json') as data:
+        images = json.load(data)['images']
+    with patch(
+        'lib.susepubliccloudinfoclient.infoserverrequests.'
+        '__stream_document_items',
+        side_effect=lambda url, info_type: iter(images)
+    ) as mock_stream:
+        first = ifsrequest.get_image_data('amazon', 'active', 'json')
+        second = ifsrequest.get_image_data('amazon', 'active', 'json')
+        assert first == second
+        assert mock_stream.call_count == 1
+        ifsrequest.configure_cache(refresh=True)
+        assert ifsrequest.get_image_data('amazon', 'active', 'json') == first
+        assert mock_stream.call_count == 2
+
+
+def test_document_store_refresh():
+    store = daemon.DocumentStore()
+    store.put('http://a', 'images', [{'id': 'old'}])
+    store.put('http://b', 'images', [{'id': 'kept'}])
+
+    def fetch(url, info_type):
+        if url == 'http://b':
+            raise LookupError('down')
+        return [{'id': 'new'}]
+    store.refresh(fetch)
+    assert store.get('http://a') == [{'id': 'new'}]
+    assert store.get('http://b') == [{'id': 'kept'}]
+
+
+def test_configuration_does_not_carry_over():
+    """Each command line starts from the default configuration"""
+    stdout = daemon._Output('out', StringIO())
+    stderr = daemon._Output('err', StringIO())
+    configure = compile(
+        'import lib.susepubliccloudinfoclient.infoserverrequests as i\n'
+        'i.configure_snapshot()\n'
+        'i.configure_cache(offline=True)\n'
+        'i.configure_memo()\n',
+        'pint',
+        'exec'
+    )
+    nothing = compile('', 'pint', 'exec')
+    try:
+        daemon.__run_script(
+            configure, 'pint', [], None, None, stdout, stderr
+        )
+        assert ifsrequest.__snapshot_enabled
+        daemon.__run_script(
+            nothing, 'pint', [], None, None, stdout, stderr
+        )
+        assert not ifsrequest.__snapshot_enabled
+        assert not ifsrequest.__cache_offline
+        assert ifsrequest.__cache is None
+        assert ifsrequest.get_memo_stats() is None
+    finally:
+        ifsrequest.reset_configuration()
+
+
+def test_refresh_uses_its_own_settings():
+    store = daemon.DocumentStore()
+    store.put('http://a', 'images', [{'id': 'old'}])
+    settings = []
+
+    def fetch(url, info_type):
+        settings.append((
+            ifsrequest.__cache.ttl,
+            ifsrequest.__cache_offline,
+            ifsrequest.__snapshot_enabled
+        ))
+        return [{'id': 'new'}]
+    # left behind by the last command line
+    ifsrequest.configure_cache(offline=True)
+    ifsrequest.configure_snapshot()
+    with patch(
+        'lib.susepubliccloudinfoclient.infoserverrequests.'
+        '__fetch_document_items',
+        side_effect=fetch
+    ):
+        daemon.__refresh_documents(
+            store, ifsrequest, threading.Lock()
+        )
+    assert settings == [(0, False, False)]
+    assert store.get('http://a') == [{'id': 'new'}]
+    assert ifsrequest.__cache is None
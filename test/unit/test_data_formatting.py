@@ -20,6 +20,7 @@
 #
 
 import lib.susepubliccloudinfoclient.infoserverrequests as ifsrequest
+from lib.susepubliccloudinfoclient.jsonstream import iter_array_items
 
 
 def test_parse():
@@ -173,10 +174,7 @@ def test_parse():
     fixture_file = '../data/v1_amazon_us-west-1_images_active.json'
     with open(fixture_file, 'r') as fixture:
         server_response = fixture.read()
-    parsed_result = ifsrequest.__parse_server_response_data(
-        server_response,
-        'images'
-    )
+    parsed_result = list(iter_array_items([server_response], 'images'))
     assert expected == parsed_result
 
 
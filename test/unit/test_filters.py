@@ -24,6 +24,10 @@ import json
 from unittest.mock import patch
 
 
+def select(match, items):
+    return list(filter(match, items))
+
+
 @patch('lib.susepubliccloudinfoclient.infoserverrequests.__warn')
 def test_valid_image_keys_from_filter(mock_warn):
     """Find all valid attributes in the `filter` flag"""
@@ -74,10 +78,9 @@ def test_filter_exact():
     fixture_file = '../data/v1_amazon_us-west-1_images_active.json'
     with open(fixture_file, 'r') as fixture:
         images = json.load(fixture)['images']
-    filtered_result = ifsrequest.__filter_exact(
-        images,
-        'id',
-        'ami-b97c8ffd'
+    filtered_result = select(
+        ifsrequest.__match_exact('id', 'ami-b97c8ffd'),
+        images
     )
     expected = [
         {
@@ -100,10 +103,9 @@ def test_filter_substring():
     fixture_file = '../data/v1_amazon_us-west-1_images_active.json'
     with open(fixture_file, 'r') as fixture:
         images = json.load(fixture)['images']
-    filtered_result = ifsrequest.__filter_substring(
-        images,
-        'name',
-        '11-sp4-byos'
+    filtered_result = select(
+        ifsrequest.__match_substring('name', '11-sp4-byos'),
+        images
     )
     expected = [
         {
@@ -137,10 +139,9 @@ def test_filter_substring_is_case_insensitive():
     fixture_file = '../data/v1_amazon_us-west-1_images_active.json'
     with open(fixture_file, 'r') as fixture:
         images = json.load(fixture)['images']
-    filtered_result = ifsrequest.__filter_substring(
-        images,
-        'name',
-        '11-SP4-BYOS'
+    filtered_result = select(
+        ifsrequest.__match_substring('name', '11-SP4-BYOS'),
+        images
     )
     expected = [
         {
@@ -174,10 +175,9 @@ def test_filter_less_than():
     fixture_file = '../data/v1_amazon_us-west-1_images_active.json'
     with open(fixture_file, 'r') as fixture:
         images = json.load(fixture)['images']
-    filtered_result = ifsrequest.__filter_less_than(
-        images,
-        'publishedon',
-        '20141024'
+    filtered_result = select(
+        ifsrequest.__match_less_than('publishedon', '20141024'),
+        images
     )
     expected_ids = [
         "ami-cd5b4f88",
@@ -193,10 +193,9 @@ def test_filter_greater_than():
     fixture_file = '../data/v1_amazon_us-west-1_images_active.json'
     with open(fixture_file, 'r') as fixture:
         images = json.load(fixture)['images']
-    filtered_result = ifsrequest.__filter_greater_than(
-        images,
-        'publishedon',
-        '20150713'
+    filtered_result = select(
+        ifsrequest.__match_greater_than('publishedon', '20150713'),
+        images
     )
     expected_ids = [
         "ami-b97c8ffd",
@@ -214,7 +213,7 @@ def test_filter_images_on_id():
     fixture_file = '../data/v1_amazon_us-west-1_images_active.json'
     with open(fixture_file, 'r') as fixture:
         superset = json.load(fixture)['images']
-    filtered_result = ifsrequest.__apply_filters(superset, filters)
+    filtered_result = select(ifsrequest.__compile_filters(filters), superset)
     expected = [
         {
             'name': 'suse-sles-11-sp4-byos-v20150714-pv-ssd-x86_64',
@@ -236,7 +235,7 @@ def test_filter_images_on_name():
     fixture_file = '../data/v1_amazon_us-west-1_images_active.json'
     with open(fixture_file, 'r') as fixture:
         superset = json.load(fixture)['images']
-    filtered_result = ifsrequest.__apply_filters(superset, filters)
+    filtered_result = select(ifsrequest.__compile_filters(filters), superset)
     expected = [
         {
             'name': 'suse-sles-11-sp4-byos-v20150714-pv-ssd-x86_64',
@@ -269,7 +268,7 @@ def test_filter_servers_on_type_substring():
     fixture_file = '../data/v1_amazon_us-east-1_servers.json'
     with open(fixture_file, 'r') as fixture:
         superset = json.load(fixture)['servers']
-    filtered_result = ifsrequest.__apply_filters(superset, filters)
+    filtered_result = select(ifsrequest.__compile_filters(filters), superset)
     expected = [
         {
             'type': 'smt-sap',
@@ -286,7 +285,7 @@ def test_filter_images_on_publishedon():
     fixture_file = '../data/v1_amazon_us-west-1_images_active.json'
     with open(fixture_file, 'r') as fixture:
         superset = json.load(fixture)['images']
-    filtered_result = ifsrequest.__apply_filters(superset, filters)
+    filtered_result = select(ifsrequest.__compile_filters(filters), superset)
     expected = [
         {
             'name':
@@ -309,7 +308,7 @@ def test_filter_images_on_publishedon_less_than():
     fixture_file = '../data/v1_amazon_us-west-1_images_active.json'
     with open(fixture_file, 'r') as fixture:
         superset = json.load(fixture)['images']
-    filtered_result = ifsrequest.__apply_filters(superset, filters)
+    filtered_result = select(ifsrequest.__compile_filters(filters), superset)
     expected_ids = [
         "ami-cd5b4f88",
         "ami-99796ddc",
@@ -324,7 +323,7 @@ def test_filter_images_on_publishedon_greater_than():
     fixture_file = '../data/v1_amazon_us-west-1_images_active.json'
     with open(fixture_file, 'r') as fixture:
         superset = json.load(fixture)['images']
-    filtered_result = ifsrequest.__apply_filters(superset, filters)
+    filtered_result = select(ifsrequest.__compile_filters(filters), superset)
     expected_ids = [
         "ami-b97c8ffd",
         "ami-2f63906b",
@@ -341,10 +340,9 @@ def test_filter_not_substring():
     fixture_file = '../data/v1_amazon_us-west-1_images_active.json'
     with open(fixture_file, 'r') as fixture:
         images = json.load(fixture)['images']
-    filtered_result = ifsrequest.__filter_not_substring(
-        images,
-        'name',
-        'sles-11'
+    filtered_result = select(
+        ifsrequest.__match_not_substring('name', 'sles-11'),
+        images
     )
     expected = [
         {
@@ -400,10 +398,9 @@ def test_filter_regex():
     fixture_file = '../data/v1_amazon_us-west-1_images_active.json'
     with open(fixture_file, 'r') as fixture:
         images = json.load(fixture)['images']
-    filtered_result = ifsrequest.__filter_regex(
-        images,
-        'name',
-        'suse-sles-12-v[0-9]*-hvm-.*'
+    filtered_result = select(
+        ifsrequest.__match_regex('name', 'suse-sles-12-v[0-9]*-hvm-.*'),
+        images
     )
     expected = [{
         'deletedon': '',
@@ -417,3 +414,43 @@ def test_filter_regex():
         'state': 'active'
     }]
     assert expected == filtered_result
+
+
+def test_compiled_filters_match_chained_filters():
+    """A combined predicate selects the same items as filtering in turn"""
+    fixture_file = '../data/v1_amazon_us-west-1_images_active.json'
+    with open(fixture_file, 'r') as fixture:
+        images = json.load(fixture)['images']
+    filters = ifsrequest.__parse_command_arg_filter(
+        'name%suse-sles-1[12].*,name!byos,publishedon>20141022,name~HVM'
+    )
+    chained = images
+    chained = select(
+        ifsrequest.__match_regex('name', 'suse-sles-1[12].*'),
+        chained
+    )
+    chained = select(ifsrequest.__match_not_substring('name', 'byos'), chained)
+    chained = select(
+        ifsrequest.__match_greater_than('publishedon', '20141022'),
+        chained
+    )
+    chained = select(ifsrequest.__match_substring('name', 'HVM'), chained)
+    assert select(ifsrequest.__compile_filters(filters), images) == chained
+    assert [item['id'] for item in chained] == [
+        'ami-17669553', 'ami-d56e9d91', 'ami-a48b92e1', 'ami-b95b4ffc'
+    ]
+
+
+def test_date_filter_skips_empty_dates():
+    """An image without a deprecation date is not deprecated before X"""
+    images = [
+        {'id': 'a', 'deprecatedon': ''},
+        {'id': 'b', 'deprecatedon': '20150101'}
+    ]
+    filters = [{'attr': 'deprecatedon', 'operator': '<', 'value': '20160101'}]
+    assert select(ifsrequest.__compile_filters(filters), images) == [images[1]]
+
+
+def test_no_filters_returns_superset():
+    images = [{'id': 'a'}]
+    assert select(ifsrequest.__compile_filters([]), images) == images
@@ -42,9 +42,11 @@ def test_errr_includes_error():
     assert 'Error:' in out.getvalue()
 
 
-@patch('lib.susepubliccloudinfoclient.infoserverrequests.requests.get')
+@patch('lib.susepubliccloudinfoclient.infoserverrequests.__get_session')
 @patch('lib.susepubliccloudinfoclient.infoserverrequests.__error')
-def test_connection_error(mock_error, mock_get):
-    mock_get.side_effect = requests.ConnectionError("Whoops!")
-    ifsrequest.__get_data('http://foo.de.bar')
+def test_connection_error(mock_error, mock_get_session):
+    mock_get_session.return_value.get.side_effect = requests.ConnectionError(
+        "Whoops!"
+    )
+    assert ifsrequest.__open_data('http://foo.de.bar') is None
     assert mock_error.called
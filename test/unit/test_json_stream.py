@@ -0,0 +1,80 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+import lib.susepubliccloudinfoclient.infoserverrequests as ifsrequest
+import json
+from lib.susepubliccloudinfoclient.jsonstream import iter_array_items
+from pytest import raises
+from unittest.mock import patch
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_items_match_full_parse_for_any_chunk_size():
+    fixture_file = '../data/v1_amazon_us-west-1_images_active.json'
+    with open(fixture_file, 'r') as fixture:
+        document = fixture.read()
+    expected = json.loads(document)['images']
+    for size in (1, 7, 64, len(document)):
+        items = list(iter_array_items(chunked(document, size), 'images'))
+        assert items == expected
+
+
+def test_other_keys_are_skipped():
+    document = '{"count": 12, "meta": {"a": [1, {"b": "]"}]}, "servers": ' \
+               '[{"ip": "1.2.3.4"}], "more": true}'
+    for size in (1, 3, len(document)):
+        items = list(iter_array_items(chunked(document, size), 'servers'))
+        assert items == [{'ip': '1.2.3.4'}]
+
+
+def test_empty_array():
+    assert list(iter_array_items(['{"regions": [ ]}'], 'regions')) == []
+
+
+def test_missing_key_raises_key_error():
+    with raises(KeyError):
+        list(iter_array_items(['{"images": []}'], 'servers'))
+    with raises(KeyError):
+        list(iter_array_items(['{}'], 'servers'))
+
+
+def test_malformed_document_raises_value_error():
+    with raises(ValueError):
+        list(iter_array_items(['{"images": [{"id": 1}'], 'images'))
+    with raises(ValueError):
+        list(iter_array_items(['<html/>'], 'images'))
+
+
+def test_items_are_produced_before_download_completes():
+    """The first item is available while the rest is still in flight"""
+    def chunks():
+        yield '{"images": [{"id": "a"},'
+        raise AssertionError('read beyond the first item')
+
+    with patch(
+        'lib.susepubliccloudinfoclient.infoserverrequests.__open_data',
+        return_value=chunks()
+    ):
+        items = ifsrequest.__iter_document_items('http://foo', 'images')
+        assert next(items) == {'id': 'a'}
@@ -0,0 +1,72 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+
+import json
+from lib.susepubliccloudinfoclient.lookup import ImageIndex, ServerIndex
+from lib.susepubliccloudinfoclient.records import Image
+
+IMAGES = [
+    {'id': 'ami-1', 'region': 'eu', 'state': 'deleted',
+     'replacementid': 'ami-2', 'name': 'sles-v1'},
+    {'id': 'ami-2', 'region': 'eu', 'state': 'deprecated',
+     'replacementid': 'ami-3', 'name': 'sles-v2'},
+    {'id': 'ami-3', 'region': 'eu', 'state': 'active',
+     'replacementid': '', 'name': 'sles-v3'},
+    {'id': 'ami-4', 'region': 'eu', 'state': 'deprecated',
+     'replacementid': 'ami-gone', 'name': 'sap-v1'},
+    {'id': 'ami-5', 'region': 'eu', 'state': 'deprecated',
+     'replacementid': 'ami-6', 'name': 'loop-v1'},
+    {'id': 'ami-6', 'region': 'eu', 'state': 'deprecated',
+     'replacementid': 'ami-5', 'name': 'loop-v2'}
+]
+
+
+def test_lookups():
+    index = ImageIndex(Image(image) for image in IMAGES)
+    assert index.lookup('id', 'ami-3')[0].name == 'sles-v3'
+    assert index.lookup('id', 'ami-unknown') == []
+    assert [image.id for image in index.lookup('replacementid', 'ami-3')] \
+        == ['ami-2']
+    assert [
+        image.id for image in index.lookup_many('id', ['ami-4', 'x', 'ami-1'])
+    ] == ['ami-4', 'ami-1']
+
+
+def test_replacement_chains():
+    index = ImageIndex(IMAGES)
+    final = index.resolve_replacement(index.lookup('id', 'ami-1')[0])
+    assert final['id'] == 'ami-3'
+    # the chain ends where the index has no further image
+    final = index.resolve_replacement(index.lookup('id', 'ami-4')[0])
+    assert final['id'] == 'ami-4'
+    # and does not go round in circles
+    final = index.resolve_replacement(index.lookup('id', 'ami-5')[0])
+    assert final['id'] in ('ami-5', 'ami-6')
+
+
+def test_server_ip_lookup():
+    with open('../data/v1_amazon_us-east-1_servers.json', 'r') as fixture:
+        servers = json.load(fixture)['servers']
+    index = ServerIndex(servers)
+    assert [
+        server['type'] for server in index.lookup('ip', '50.17.208.31')
+    ] == ['regionserver']
@@ -0,0 +1,140 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+
+import lib.susepubliccloudinfoclient.infoserverrequests as ifsrequest
+import json
+from lib.susepubliccloudinfoclient.memo import Memo, estimate_size
+from pytest import fixture
+from unittest.mock import patch
+
+with open('../data/v1_amazon_us-west-1_images_active.json', 'rb') as data:
+    BODY = data.read()
+
+
+def respond(request):
+    return 200, {'Content-Type': 'application/json'}, BODY
+
+
+@fixture
+def server(stand_in):
+    requests = stand_in(respond).requests
+    ifsrequest.configure_memo()
+    events = []
+    ifsrequest.add_timing_hook(events.append)
+    yield requests, events
+    ifsrequest.remove_timing_hook(events.append)
+    ifsrequest.configure_memo(enabled=False)
+    ifsrequest.configure_cache(enabled=False)
+
+
+def items(number):
+    return [{'id': 'image-%d' % count} for count in range(number)]
+
+
+def test_memo_lru_eviction():
+    size = estimate_size(items(10))
+    memo = Memo(max_size=size * 2)
+    memo.put('a', items(10))
+    memo.put('b', items(10))
+    assert memo.get('a') is not None
+    memo.put('c', items(10))
+    assert memo.get('b') is None
+    assert memo.get('a') is not None
+    assert memo.get('c') is not None
+    stats = memo.stats()
+    assert stats['entries'] == 2
+    assert stats['size'] == size * 2
+    assert stats['evictions'] == 1
+    assert stats['hits'] == 3
+    assert stats['misses'] == 1
+
+
+def test_memo_ttl():
+    memo = Memo(ttl=60)
+    memo.put('a', items(1))
+    with patch('time.monotonic', return_value=memo.entries['a'][1] + 61):
+        assert memo.get('a') is None
+    assert memo.stats()['entries'] == 0
+    assert memo.size == 0
+
+
+def test_memo_too_big_entry_not_kept():
+    memo = Memo(max_size=estimate_size(items(10)))
+    memo.put('a', items(1))
+    assert memo.put('b', items(100)) == items(100)
+    assert memo.get('b') is None
+    assert memo.get('a') is not None
+    memo.put('a', items(2))
+    assert memo.size == estimate_size(items(2))
+    memo.clear()
+    assert memo.size == 0
+
+
+def test_estimate_size_grows_with_items():
+    assert estimate_size(items(1)) < estimate_size(items(100))
+    assert estimate_size([]) > 0
+
+
+def test_repeated_query_parses_and_filters_once(server):
+    requests, events = server
+    first = ifsrequest.get_image_data(
+        'amazon', 'active', 'json', 'us-west-1',
+        'name~byos,publishedon>20150101'
+    )
+    stages = [event['stage'] for event in events]
+    assert stages.count('parse') == 1
+    assert stages.count('filter') == 2
+    del events[:]
+    second = ifsrequest.get_image_data(
+        'amazon', 'active', 'json', 'us-west-1',
+        'publishedon>20150101,name~byos'
+    )
+    assert first == second
+    assert len(json.loads(second)['images']) == 3
+    assert [event['stage'] for event in events] == ['cache', 'format']
+    assert events[0]['result'] == 'memory'
+    assert len(requests) == 1
+    stats = ifsrequest.get_memo_stats()
+    assert stats['entries'] == 2
+    assert stats['size'] > 0
+
+
+def test_other_filters_reuse_the_document(server):
+    requests, events = server
+    byos = ifsrequest.get_images('amazon', 'active', 'us-west-1', 'name~byos')
+    images = ifsrequest.get_images('amazon', 'active', 'us-west-1')
+    assert len(byos) == 5
+    assert len(images) == 13
+    assert len(requests) == 1
+    assert [event['stage'] for event in events].count('parse') == 1
+
+
+def test_refresh_bypasses_the_memo(server, tmp_path):
+    requests, events = server
+    ifsrequest.get_images('amazon', 'active', 'us-west-1', 'name~byos')
+    ifsrequest.configure_cache(directory=str(tmp_path), refresh=True)
+    ifsrequest.get_images('amazon', 'active', 'us-west-1', 'name~byos')
+    assert len(requests) == 2
+
+
+def test_no_memo_by_default():
+    assert ifsrequest.get_memo_stats() is None
@@ -0,0 +1,94 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+import lib.susepubliccloudinfoclient.infoserverrequests as ifsrequest
+import json
+import time
+from pytest import fixture, raises
+from unittest.mock import patch
+
+
+def respond(request):
+    """
+        Serve one item per region; 'us-east-1' answers slowly and
+        'broken-1' does not exist
+    """
+    region, info_type = request.path.split('/')[3:5]
+    info_type = info_type.replace('.json', '')
+    time.sleep(0.3 if region == 'us-east-1' else 0.1)
+    if region == 'broken-1':
+        return 404, {}, b''
+    return 200, {}, json.dumps(
+        {info_type: [{'id': 'id-%s' % region, 'region': region}]}
+    ).encode()
+
+
+@fixture
+def server(stand_in):
+    yield stand_in(respond)
+    ifsrequest.configure_concurrency()
+
+
+def test_split_regions():
+    assert ifsrequest.__split_regions('a, b,a,,c') == ['a', 'b', 'c']
+    assert ifsrequest.__split_regions('all') == ['all']
+    assert ifsrequest.__split_regions('a,all') == ['all']
+    assert ifsrequest.__split_regions(None) == ['all']
+
+
+def test_regions_are_merged_in_requested_order(server):
+    """The slow first region still comes first"""
+    result = json.loads(ifsrequest.get_image_data(
+        'amazon', 'active', 'json', 'us-east-1,eu-west-1,ap-south-1'
+    ))
+    assert [image['region'] for image in result['images']] == [
+        'us-east-1', 'eu-west-1', 'ap-south-1'
+    ]
+    assert server.max_active > 1
+
+
+def test_concurrency_limit(server):
+    ifsrequest.configure_concurrency(max_workers=1)
+    ifsrequest.get_server_data(
+        'amazon', None, 'json', 'us-east-1,eu-west-1,ap-south-1'
+    )
+    assert server.max_active == 1
+
+
+@patch('lib.susepubliccloudinfoclient.infoserverrequests.__warn')
+def test_failing_region_is_skipped(mock_warn, server, capsys):
+    result = json.loads(ifsrequest.get_image_data(
+        'amazon', 'active', 'json', 'eu-west-1,broken-1,ap-south-1'
+    ))
+    assert [image['region'] for image in result['images']] == [
+        'eu-west-1', 'ap-south-1'
+    ]
+    assert mock_warn.call_count == 1
+    assert 'broken-1' in mock_warn.call_args[0][0]
+
+
+def test_all_regions_failing_is_an_error(server, capsys):
+    with raises(LookupError):
+        ifsrequest.get_image_data(
+            'amazon', 'active', 'json', 'broken-1,broken-1 '
+        )
+    with raises(LookupError):
+        ifsrequest.get_image_data('amazon', 'active', 'json', 'broken-1')
@@ -0,0 +1,120 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+
+import lib.susepubliccloudinfoclient.infoserverrequests as ifsrequest
+import copy
+import json
+import pickle
+from io import StringIO
+from lib.susepubliccloudinfoclient.records import Image, Provider
+from pytest import fixture, raises
+from unittest.mock import patch
+
+
+def load_fixture(name, info_type):
+    with open('../data/%s' % name, 'r') as fixture:
+        return json.load(fixture)[info_type]
+
+
+def fake_documents(url, info_type):
+    if info_type == 'images':
+        return iter(
+            load_fixture('v1_amazon_us-west-1_images_active.json', 'images')
+        )
+    elif info_type == 'providers':
+        return iter([{'name': 'amazon'}, {'name': 'google'}])
+    return iter(load_fixture('v1_amazon_us-east-1_servers.json', 'servers'))
+
+
+@fixture
+def documents():
+    with patch(
+        'lib.susepubliccloudinfoclient.infoserverrequests.'
+        '__iter_document_items',
+        side_effect=fake_documents
+    ) as mock_documents:
+        yield mock_documents
+
+
+def test_images_are_records(documents):
+    images = ifsrequest.get_images('amazon', 'active', 'us-west-1')
+    assert len(images) == 13
+    assert all(isinstance(image, Image) for image in images)
+    assert images[0].id == 'ami-b97c8ffd'
+    assert images[0]['publishedon'] == '20150714'
+    assert documents.call_args[0][0].endswith(
+        '/amazon/us-west-1/images/active.json'
+    )
+
+
+def test_filters_apply_to_records(documents):
+    servers = ifsrequest.get_servers('amazon', None, 'us-east-1', 'type~sap')
+    assert [server.type for server in servers] == ['smt-sap']
+
+
+def test_missing_fields_read_as_none():
+    image = Image({'name': 'sles', 'urn': 'SUSE:sles:15'})
+    assert image.id is None
+    assert image.urn == 'SUSE:sles:15'
+    with raises(AttributeError):
+        image.color
+    with raises(AttributeError):
+        image.id = 'changed'
+
+
+def test_record_equality():
+    assert Provider({'name': 'amazon'}) == Provider({'name': 'amazon'})
+    assert Provider({'name': 'amazon'}) != Image({'name': 'amazon'})
+
+
+def test_records_copy_and_pickle():
+    image = Image({'id': 'ami-1', 'name': 'sles'})
+    for duplicate in (
+            copy.copy(image),
+            copy.deepcopy(image),
+            pickle.loads(pickle.dumps(image))):
+        assert duplicate == image
+        assert duplicate.name == 'sles'
+        assert duplicate.state is None
+
+
+def test_format_records_matches_data_functions(documents):
+    images = ifsrequest.get_images('amazon', None, 'all', 'name~byos')
+    for result_format in ('json', 'ndjson', 'plain', 'xml'):
+        assert ifsrequest.format_records(
+            images, 'images', result_format
+        ) == ifsrequest.get_image_data(
+            'amazon', None, result_format, 'all', 'name~byos'
+        )
+    out = StringIO()
+    assert ifsrequest.format_records(images, 'images', 'json', out) == 5
+    assert json.loads(out.getvalue())['images'][0]['name'].startswith(
+        'suse-sles-11-sp4-byos'
+    )
+    assert ifsrequest.format_records([], 'images', 'json') == \
+        '{\n  "images": []\n}'
+
+
+def test_providers(documents):
+    assert [
+        provider.name for provider in ifsrequest.get_providers()
+    ] == ['amazon', 'google']
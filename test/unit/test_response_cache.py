@@ -0,0 +1,205 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+import json
+import lib.susepubliccloudinfoclient.infoserverrequests as ifsrequest
+import requests
+import threading
+from lib.susepubliccloudinfoclient.responsecache import ResponseCache
+from pytest import fixture, raises
+from unittest.mock import patch
+
+BODY = b'{"images": [{"id": "ami-b97c8ffd", "name": "sles"}]}'
+
+
+def respond(request):
+    """Serve BODY with an ETag and answer matching revalidations with 304"""
+    if request.headers.get('If-None-Match') == '"v1"':
+        return 304, {}, b''
+    return 200, {'Content-Type': 'application/json', 'ETag': '"v1"'}, BODY
+
+
+@fixture
+def server(stand_in):
+    return stand_in(respond)
+
+
+@fixture
+def url(server):
+    return server.url + '/v1/amazon/images/active.json'
+
+
+def read(url):
+    """Return the document at url as queries read it"""
+    return ''.join(ifsrequest.__open_data(url) or ())
+
+
+def headers_seen(server):
+    return [request.headers for request in server.requests]
+
+
+@fixture
+def cache_dir(tmp_path):
+    yield str(tmp_path)
+    ifsrequest.configure_cache(enabled=False)
+
+
+def test_fresh_entry_served_without_request(server, url, cache_dir):
+    """A response younger than the TTL is answered from disk"""
+    ifsrequest.configure_cache(directory=cache_dir, ttl=3600)
+    assert read(url) == BODY.decode()
+    assert read(url) == BODY.decode()
+    assert len(server.requests) == 1
+
+
+def test_stale_entry_is_revalidated(server, url, cache_dir):
+    """An expired response is revalidated with a conditional request"""
+    ifsrequest.configure_cache(directory=cache_dir, ttl=0)
+    assert read(url) == BODY.decode()
+    assert read(url) == BODY.decode()
+    assert len(server.requests) == 2
+    assert 'If-None-Match' not in headers_seen(server)[0]
+    assert headers_seen(server)[1]['If-None-Match'] == '"v1"'
+
+
+def test_refresh_ignores_cache(server, url, cache_dir):
+    """With refresh the document is downloaded unconditionally"""
+    ifsrequest.configure_cache(directory=cache_dir, ttl=3600)
+    read(url)
+    ifsrequest.configure_cache(directory=cache_dir, ttl=3600, refresh=True)
+    assert read(url) == BODY.decode()
+    assert len(server.requests) == 2
+    assert 'If-None-Match' not in headers_seen(server)[1]
+
+
+def test_disabled_cache_always_fetches(server, url, cache_dir):
+    ifsrequest.configure_cache(enabled=False)
+    read(url)
+    read(url)
+    assert len(server.requests) == 2
+
+
+def test_streamed_query_is_cached(server, url, cache_dir):
+    """A document parsed as it streams in is read to the end and stored"""
+    ifsrequest.configure_cache(directory=cache_dir, ttl=3600)
+    for attempt in range(2):
+        images = ifsrequest.get_image_data('amazon', 'active', 'json')
+        assert json.loads(images)['images'][0]['id'] == 'ami-b97c8ffd'
+    assert len(server.requests) == 1
+
+
+def wait_for_refreshes():
+    for thread in threading.enumerate():
+        if thread.name == 'pint-refresh':
+            thread.join()
+
+
+@patch('lib.susepubliccloudinfoclient.infoserverrequests.__warn')
+def test_expired_entry_served_while_refreshed(
+        mock_warn, server, url, cache_dir):
+    """Within max_stale an expired response is used and refreshed later"""
+    ifsrequest.configure_cache(directory=cache_dir, ttl=0, max_stale=3600)
+    assert read(url) == BODY.decode()
+    assert read(url) == BODY.decode()
+    wait_for_refreshes()
+    assert len(server.requests) == 2
+    assert headers_seen(server)[1]['If-None-Match'] == '"v1"'
+    assert 'refreshing it in the background' in mock_warn.call_args[0][0]
+
+
+@patch('lib.susepubliccloudinfoclient.infoserverrequests.__warn')
+def test_cached_entry_stands_in_for_server(mock_warn, server, url, cache_dir):
+    ifsrequest.configure_cache(directory=cache_dir, max_stale=3600)
+    read(url)
+    ifsrequest.configure_cache(
+        directory=cache_dir, max_stale=3600, refresh=True
+    )
+    with patch(
+        'lib.susepubliccloudinfoclient.infoserverrequests.__get_session'
+    ) as mock_session:
+        mock_session.return_value.get.side_effect = (
+            requests.exceptions.ConnectionError('down')
+        )
+        assert read(url) == BODY.decode()
+    assert 'the server could not be reached' in mock_warn.call_args[0][0]
+
+
+@patch('lib.susepubliccloudinfoclient.infoserverrequests.__warn')
+@patch('lib.susepubliccloudinfoclient.infoserverrequests.__error')
+def test_offline(mock_error, mock_warn, server, url, cache_dir):
+    """Offline only cached responses within max_stale are used"""
+    mock_error.side_effect = LookupError('offline')
+    ifsrequest.configure_cache(directory=cache_dir, offline=True)
+    with raises(LookupError):
+        read(url)
+    ifsrequest.configure_cache(directory=cache_dir)
+    read(url)
+    ifsrequest.configure_cache(directory=cache_dir, offline=True)
+    assert read(url) == BODY.decode()
+    mock_warn.assert_not_called()
+    ifsrequest.configure_cache(
+        directory=cache_dir, ttl=0, max_stale=3600, offline=True
+    )
+    assert read(url) == BODY.decode()
+    assert 'answering offline' in mock_warn.call_args[0][0]
+    ifsrequest.configure_cache(
+        directory=cache_dir, ttl=0, max_stale=0, offline=True
+    )
+    with raises(LookupError):
+        read(url)
+    assert len(server.requests) == 1
+
+
+def test_lru_eviction(tmp_path):
+    """The least recently used entries go first once max_size is exceeded"""
+    cache = ResponseCache(directory=str(tmp_path), max_size=25)
+    cache.store('http://a', b'a' * 10)
+    cache.store('http://b', b'b' * 10)
+    # use 'a' so that 'b' becomes the least recently used entry
+    assert cache.lookup('http://a')
+    cache.store('http://c', b'c' * 10)
+    assert cache.lookup('http://b') is None
+    assert cache.lookup('http://a').body == b'a' * 10
+    assert cache.lookup('http://c').body == b'c' * 10
+
+
+def test_corrupt_entry_is_ignored(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path))
+    cache.store('http://a', b'abc', etag='"x"')
+    body_path = [
+        path for path in tmp_path.iterdir() if path.suffix == '.body'
+    ][0]
+    body_path.write_bytes(b'ab')
+    assert cache.lookup('http://a') is None
+
+
+def test_partially_read_stream_is_not_stored(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path))
+    chunks = cache.store_chunks('http://a', [b'ab', b'cd'])
+    assert next(chunks) == b'ab'
+    chunks.close()
+    assert cache.lookup('http://a') is None
+    assert list(cache.store_chunks('http://a', [b'ab', b'cd'])) == [
+        b'ab', b'cd'
+    ]
+    entry = cache.lookup('http://a', load_body=False)
+    assert entry.body is None
+    assert b''.join(cache.iter_body(entry, chunk_size=1)) == b'abcd'
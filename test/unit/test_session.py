@@ -0,0 +1,107 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+import lib.susepubliccloudinfoclient.infoserverrequests as ifsrequest
+from lib.susepubliccloudinfoclient.session import InfoServerSession
+from pytest import fixture
+from unittest.mock import patch
+
+BODY = b'{"regions": []}'
+
+
+class Flaky(object):
+    """Fail the first `failures` requests with 503"""
+
+    def __init__(self):
+        self.failures = 0
+
+    def __call__(self, request):
+        if self.failures:
+            self.failures -= 1
+            return 503, {}, b''
+        return 200, {}, BODY
+
+
+@fixture
+def flaky():
+    return Flaky()
+
+
+@fixture
+def server(stand_in, flaky):
+    yield stand_in(flaky, keep_alive=True)
+    ifsrequest.configure_session()
+
+
+def url(server):
+    return server.url + '/v1/oracle/regions.json'
+
+
+def read(url):
+    """Return the document at url as queries read it"""
+    return ''.join(ifsrequest.__open_data(url) or ())
+
+
+def test_session_is_shared():
+    assert ifsrequest.__get_session() is ifsrequest.__get_session()
+
+
+def test_connection_is_reused(server):
+    """Subsequent requests go over the same kept-alive connection"""
+    ifsrequest.configure_session()
+    read(url(server))
+    read(url(server))
+    assert len(server.requests) == 2
+    first, second = server.requests
+    assert first.client_address == second.client_address
+    assert 'gzip' in server.requests[0].headers['Accept-Encoding']
+
+
+def test_retry_on_server_error(server, flaky):
+    """Transient 5xx responses are retried"""
+    flaky.failures = 2
+    ifsrequest.configure_session(backoff_factor=0)
+    assert read(url(server)) == BODY.decode()
+    assert len(server.requests) == 3
+
+
+@patch('lib.susepubliccloudinfoclient.infoserverrequests.__error')
+def test_retries_are_bounded(mock_error, server, flaky):
+    """Once the retries are used up the last error is reported"""
+    flaky.failures = 10
+    ifsrequest.configure_session(retries=1, backoff_factor=0)
+    read(url(server))
+    assert len(server.requests) == 2
+    assert 'responded with an error' in mock_error.call_args[0][0]
+
+
+def test_default_timeout_is_applied():
+    session = InfoServerSession(connect_timeout=1, read_timeout=2)
+    with patch('requests.Session.request') as mock_request:
+        session.get('http://foo.de.bar')
+    assert mock_request.call_args[1]['timeout'] == (1, 2)
+
+
+def test_explicit_timeout_wins():
+    session = InfoServerSession()
+    with patch('requests.Session.request') as mock_request:
+        session.get('http://foo.de.bar', timeout=5)
+    assert mock_request.call_args[1]['timeout'] == 5
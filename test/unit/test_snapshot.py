@@ -0,0 +1,215 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+import lib.susepubliccloudinfoclient.infoserverrequests as ifsrequest
+import lib.susepubliccloudinfoclient.snapshot as snapshot
+import json
+from pytest import fixture, raises
+from unittest.mock import patch
+
+
+def load_fixture(name, info_type):
+    with open('../data/%s' % name, 'r') as fixture:
+        return json.load(fixture)[info_type]
+
+
+def fake_documents(url, info_type):
+    if info_type == 'images':
+        return iter(
+            load_fixture('v1_amazon_us-west-1_images_active.json', 'images')
+        )
+    return iter(load_fixture('v1_amazon_us-east-1_servers.json', 'servers'))
+
+
+@fixture
+def snapshot_path(tmp_path):
+    path = str(tmp_path / 'snapshot.db')
+    with patch(
+        'lib.susepubliccloudinfoclient.infoserverrequests.'
+        '__iter_document_items',
+        side_effect=fake_documents
+    ):
+        counts = snapshot.sync_snapshot(['amazon'], path)
+    assert counts == {'amazon': {'images': 13, 'servers': 3}}
+    yield path
+    ifsrequest.configure_snapshot(enabled=False)
+
+
+def query(path, info_type, command_arg_filter, regions=None, doc_type=None):
+    return list(snapshot.query_snapshot(
+        'amazon',
+        info_type,
+        regions,
+        doc_type,
+        ifsrequest.__parse_command_arg_filter(command_arg_filter),
+        path
+    ))
+
+
+def test_filters_match_in_memory_filters(snapshot_path):
+    """Every operator gives the same answer as the in-memory filters"""
+    images = load_fixture('v1_amazon_us-west-1_images_active.json', 'images')
+    for command_arg_filter in (
+            'id=ami-b97c8ffd',
+            'name~11-SP4',
+            'name!byos',
+            'name%suse-sles-12-v[0-9]*-hvm-.*',
+            'publishedon>20141023',
+            'publishedon<20150127',
+            'publishedon=20150714',
+            'deprecatedon<20200101',
+            'name~sles,name!byos,publishedon>20141023'):
+        filters = ifsrequest.__parse_command_arg_filter(command_arg_filter)
+        expected = list(filter(ifsrequest.__compile_filters(filters), images))
+        assert query(snapshot_path, 'images', command_arg_filter) == \
+            expected, command_arg_filter
+
+
+def test_region_and_state(snapshot_path):
+    assert len(query(snapshot_path, 'images', None, ['us-west-1'])) == 13
+    assert query(snapshot_path, 'images', None, ['eu-west-1']) == []
+    assert len(query(snapshot_path, 'images', None, None, 'active')) == 13
+    assert query(snapshot_path, 'images', None, None, 'deleted') == []
+
+
+def test_server_type(snapshot_path):
+    smt = query(snapshot_path, 'servers', None, None, 'smt')
+    assert [server['type'] for server in smt] == ['smt-sles', 'smt-sap']
+    servers = query(snapshot_path, 'servers', 'ip=50.17.208.31')
+    assert [server['type'] for server in servers] == ['regionserver']
+
+
+def test_snapshot_age(snapshot_path):
+    assert snapshot.get_snapshot_age('amazon', snapshot_path) < 60
+    assert snapshot.get_snapshot_age('google', snapshot_path) is None
+
+
+def test_unknown_provider_is_an_error(snapshot_path):
+    with raises(LookupError):
+        snapshot.query_snapshot('google', 'images', path=snapshot_path)
+
+
+def test_query_mode(snapshot_path):
+    """get_image_data answers from the snapshot without any request"""
+    ifsrequest.configure_snapshot(path=snapshot_path)
+    with patch(
+        'lib.susepubliccloudinfoclient.infoserverrequests.__get_session'
+    ) as mock_session:
+        result = json.loads(ifsrequest.get_image_data(
+            'amazon', 'active', 'json', 'us-west-1', 'id=ami-b97c8ffd'
+        ))
+    assert not mock_session.called
+    assert [image['id'] for image in result['images']] == ['ami-b97c8ffd']
+
+
+@patch('lib.susepubliccloudinfoclient.infoserverrequests.__error')
+def test_unusable_snapshot_is_an_error(mock_error, tmp_path):
+    # a directory where the snapshot database belongs
+    ifsrequest.configure_snapshot(path=str(tmp_path))
+    mock_error.side_effect = LookupError('failed')
+    try:
+        with raises(LookupError):
+            ifsrequest.get_image_data('amazon', 'active', 'json')
+    finally:
+        ifsrequest.configure_snapshot(enabled=False)
+    assert 'Unable to read the snapshot' in mock_error.call_args[0][0]
+
+
+def test_sync_replaces_provider_data(snapshot_path):
+    with patch(
+        'lib.susepubliccloudinfoclient.infoserverrequests.'
+        '__iter_document_items',
+        return_value=iter([])
+    ):
+        snapshot.sync_snapshot(['amazon'], snapshot_path)
+    assert query(snapshot_path, 'images', None) == []
+
+
+def changed_documents(url, info_type):
+    """The fixture images after a round of state changes on the server"""
+    images = load_fixture('v1_amazon_us-west-1_images_active.json', 'images')
+    documents = {'active': [], 'inactive': [], 'deprecated': [], 'deleted': []}
+    for index, image in enumerate(images):
+        if index == 2:
+            documents['deprecated'].append(
+                dict(image, state='deprecated', deprecatedon='20260101')
+            )
+        elif index == 3:
+            documents['active'].append(dict(image, replacementid='ami-new'))
+        elif index == 10:
+            documents['deleted'].append(
+                dict(image, state='deleted', deletedon='20260101')
+            )
+        elif index != 11:
+            documents['active'].append(image)
+    documents['active'].append(dict(
+        images[0], id='ami-new', name='suse-sles-15-sp7-v20260101'
+    ))
+    return iter(documents[url.rsplit('/', 1)[1].split('.')[0]])
+
+
+def test_incremental_update(snapshot_path):
+    """Only the changes are reported and applied"""
+    with patch(
+        'lib.susepubliccloudinfoclient.infoserverrequests.'
+        '__iter_document_items',
+        side_effect=changed_documents
+    ) as mock_documents:
+        events = list(snapshot.update_snapshot(path=snapshot_path))
+    assert [
+        url.rsplit('/', 1)[1]
+        for (url, info_type), kwargs in mock_documents.call_args_list
+    ] == ['active.json', 'inactive.json', 'deprecated.json', 'deleted.json']
+    assert [
+        (event['event'], event['image']['id'], event['image']['state'])
+        for event in events
+    ] == [
+        ('updated', 'ami-17669553', 'active'),
+        ('added', 'ami-new', 'active'),
+        ('transitioned', 'ami-6f66952b', 'deprecated'),
+        ('transitioned', 'ami-b95b4ffc', 'deleted'),
+        ('removed', 'ami-557a6e10', 'active')
+    ]
+    assert events[0]['previous']['replacementid'] == ''
+    assert 'previous' not in events[1]
+    assert len(query(snapshot_path, 'images', None, None, 'active')) == 11
+    assert [
+        image['id'] for image in
+        query(snapshot_path, 'images', None, None, 'deprecated')
+    ] == ['ami-6f66952b']
+    assert [
+        image['deletedon'] for image in
+        query(snapshot_path, 'images', None, None, 'deleted')
+    ] == ['20260101']
+    assert query(snapshot_path, 'images', 'id=ami-557a6e10') == []
+
+
+def test_unchanged_update_skips_deleted_images(snapshot_path):
+    with patch(
+        'lib.susepubliccloudinfoclient.infoserverrequests.'
+        '__iter_document_items',
+        side_effect=lambda url, info_type: iter(
+            load_fixture('v1_amazon_us-west-1_images_active.json', 'images')
+            if url.endswith('/active.json') else []
+        )
+    ) as mock_documents:
+        assert list(snapshot.update_snapshot(['amazon'], snapshot_path)) == []
+    assert mock_documents.call_count == 3
@@ -0,0 +1,127 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+import lib.susepubliccloudinfoclient.infoserverrequests as ifsrequest
+import json
+from io import StringIO
+from lxml import etree
+from unittest.mock import patch
+
+ODD_ITEMS = [
+    {'name': 'quote " & <tag> \'single\'', 'id': 'x\ny'},
+    {'name': 'café ☃', 'id': '', 'region': 'West US'}
+]
+
+
+def fixture_images():
+    fixture_file = '../data/v1_amazon_us-west-1_images_active.json'
+    with open(fixture_file, 'r') as fixture:
+        return json.load(fixture)['images']
+
+
+def reference_json(items, info_type):
+    """The formatter as it was before streaming"""
+    return json.dumps(
+        {info_type: items},
+        sort_keys=True,
+        indent=2,
+        separators=(',', ': '))
+
+
+def reference_xml(items, info_type):
+    """The formatter as it was before streaming"""
+    root = etree.Element(info_type)
+    for item in items:
+        etree.SubElement(root, ifsrequest.__inflect(info_type), item)
+    return etree.tostring(
+        root,
+        xml_declaration=True,
+        encoding='UTF-8',
+        pretty_print=True).decode()
+
+
+def test_json_output_is_unchanged():
+    for items in (fixture_images(), ODD_ITEMS, ODD_ITEMS[:1], []):
+        assert ifsrequest.__reformat(iter(items), 'images', 'json') == \
+            reference_json(items, 'images')
+
+
+def test_xml_output_is_unchanged():
+    for items in (fixture_images(), ODD_ITEMS, ODD_ITEMS[:1], []):
+        assert ifsrequest.__reformat(iter(items), 'servers', 'xml') == \
+            reference_xml(items, 'servers')
+
+
+def test_empty_result_is_a_single_piece():
+    for result_format in ('json', 'xml'):
+        pieces = list(ifsrequest.__iter_reformat([], 'images', result_format))
+        assert len(pieces) == 1
+
+
+def test_output_starts_before_items_are_exhausted():
+    """The first item is written before the second one is requested"""
+    def items():
+        yield ODD_ITEMS[0]
+        raise AssertionError('requested the second item')
+
+    for result_format in ('json', 'xml'):
+        pieces = ifsrequest.__iter_reformat(items(), 'images', result_format)
+        assert 'quote' in next(pieces)
+
+
+@patch('lib.susepubliccloudinfoclient.infoserverrequests.__get_items')
+def test_query_writes_to_out(mock_get_items):
+    mock_get_items.return_value = iter(fixture_images())
+    out = StringIO()
+    count = ifsrequest.get_image_data(
+        'amazon', 'active', 'json', 'us-west-1', 'name~byos', out=out
+    )
+    assert count == 5
+    assert json.loads(out.getvalue())['images'][0]['id'] == 'ami-b97c8ffd'
+
+
+def test_ndjson_output():
+    images = fixture_images()
+    result = ifsrequest.__reformat(images, 'images', 'ndjson')
+    lines = result.split('\n')
+    assert len(lines) == len(images)
+    assert [json.loads(line) for line in lines] == images
+    assert ifsrequest.__reformat([], 'images', 'ndjson') == ''
+
+
+def test_plain_output_is_aligned():
+    servers = [
+        {'type': 'smt-sles', 'name': 'smt-ec2.susecloud.net', 'ip': '1.2.3.4'},
+        {'type': 'regionserver', 'name': '', 'ip': '50.17.208.31'}
+    ]
+    result = ifsrequest.__reformat(servers, 'servers', 'plain')
+    assert result == (
+        'type          name                   ip\n'
+        'smt-sles      smt-ec2.susecloud.net  1.2.3.4\n'
+        'regionserver                         50.17.208.31'
+    )
+    assert ifsrequest.__reformat([], 'servers', 'plain') == ''
+
+
+def test_plain_is_the_default():
+    servers = [{'name': 'a'}]
+    assert ifsrequest.__reformat(servers, 'servers', 'plain') == \
+        ifsrequest.__reformat(servers, 'servers', 'unknown')
@@ -0,0 +1,122 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2026 SUSE Linux GmbH.  All rights reserved.
+#
+# This file is part of susePublicCloudInfoClient
+#
+# susePublicCloudInfoClient is free software: you can redistribute it
+# and/or modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation, either version 3 of
+# the License, or (at your option) any later version.
+#
+# susePublicCloudInfoClient is distributed in the hope that it will
+# be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with susePublicCloudInfoClient. If not, see
+# <http://www.gnu.org/licenses/>.
+#
+
+import lib.susepubliccloudinfoclient.infoserverrequests as ifsrequest
+import gzip
+import json
+from io import StringIO
+from lib.susepubliccloudinfoclient.timings import Timings
+from pytest import fixture
+
+with open('../data/v1_amazon_us-west-1_images_active.json', 'rb') as data:
+    BODY = data.read()
+
+
+class Respond(object):
+    """Serve BODY, compressed with gzip to clients accepting it"""
+
+    def __init__(self):
+        self.compress = False
+
+    def __call__(self, request):
+        headers = {'Content-Type': 'application/json'}
+        if self.compress and 'gzip' in request.headers['Accept-Encoding']:
+            headers['Content-Encoding'] = 'gzip'
+            return 200, headers, gzip.compress(BODY)
+        return 200, headers, BODY
+
+
+@fixture
+def respond():
+    return Respond()
+
+
+@fixture
+def timings(stand_in, respond, tmp_path):
+    stand_in(respond)
+    ifsrequest.configure_cache(directory=str(tmp_path))
+    timings = Timings()
+    ifsrequest.add_timing_hook(timings)
+    yield timings
+    ifsrequest.remove_timing_hook(timings)
+    ifsrequest.configure_cache(enabled=False)
+
+
+def test_stages_of_a_query(timings):
+    out = StringIO()
+    count = ifsrequest.get_image_data(
+        'amazon', 'active', 'json', 'us-west-1',
+        'name~byos,publishedon>20150101', out=out
+    )
+    assert count == 3
+    assert len(json.loads(out.getvalue())['images']) == 3
+    summary = timings.summary()
+    assert summary['requests'] == 1
+    assert summary['bytes'] == summary['transferred'] == len(BODY)
+    assert summary['items'] == 13
+    assert summary['cache'] == {'miss': 1}
+    assert [
+        (a_filter['filter'], a_filter['items_in'], a_filter['items_out'])
+        for a_filter in summary['filters']
+    ] == [('name~byos', 13, 5), ('publishedon>20150101', 5, 3)]
+    stages = [event['stage'] for event in timings.events]
+    for stage in ('request', 'download', 'parse', 'format', 'write'):
+        assert stage in stages
+    assert all(seconds >= 0 for seconds in summary['stages'].values())
+
+
+def test_cache_hits_are_reported(timings):
+    ifsrequest.get_image_data('amazon', 'active', region='us-west-1')
+    ifsrequest.get_image_data('amazon', 'active', region='us-west-1')
+    summary = timings.summary()
+    assert summary['cache'] == {'hit': 1, 'miss': 1}
+    assert summary['requests'] == 1
+    sources = [
+        event['source'] for event in timings.events
+        if event['stage'] == 'download'
+    ]
+    assert sources == ['server', 'cache']
+    text = timings.format()
+    assert text.startswith('Timings:')
+    assert 'cache     hit 1, miss 1' in text
+    assert json.loads(timings.format('json'))['items'] == 26
+
+
+def test_no_events_without_hooks(timings):
+    ifsrequest.remove_timing_hook(timings)
+    ifsrequest.get_image_data('amazon', 'active', region='us-west-1')
+    assert timings.events == []
+
+
+def test_compressed_transfer(timings, respond):
+    respond.compress = True
+    out = StringIO()
+    count = ifsrequest.get_image_data(
+        'amazon', 'active', 'ndjson', 'us-west-1', out=out
+    )
+    assert count == 13
+    download = [
+        event for event in timings.events if event['stage'] == 'download'
+    ][0]
+    assert download['encoding'] == 'gzip'
+    assert download['bytes'] == len(BODY)
+    assert download['transferred'] == len(gzip.compress(BODY))
+    assert timings.summary()['transferred'] < len(BODY)